@@ -0,0 +1,32 @@
+"""
+Compare memory use and groupby speed of a statement as read from CSV and
+after compact_transactions.
+
+Usage: PYTHONPATH=src python benchmarks/bench_compact_transactions.py [rows]
+"""
+import sys
+import time
+from synthetic import make_statement
+from utils import compact_transactions, memory_usage
+
+
+def timed_groupby(df, amount):
+    start = time.perf_counter()
+    df.groupby(['title', 'date'], observed=True)[amount].sum()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    df = make_statement(rows)
+    start = time.perf_counter()
+    compact = compact_transactions(df)
+    compact_time = time.perf_counter() - start
+    before = memory_usage(df)
+    after = memory_usage(compact)
+    print(f"rows: {rows}")
+    print(f"memory before:        {before / 2**20:.1f} MiB")
+    print(f"memory after:         {after / 2**20:.1f} MiB ({before / after:.1f}x smaller)")
+    print(f"compact_transactions: {compact_time:.2f}s")
+    print(f"groupby before:       {timed_groupby(df, 'amount'):.2f}s")
+    print(f"groupby after:        {timed_groupby(compact, 'amount_cents'):.2f}s")
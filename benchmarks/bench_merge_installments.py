@@ -0,0 +1,46 @@
+"""
+Benchmark merge_installments on a synthetic statement.
+
+Usage: PYTHONPATH=src python benchmarks/bench_merge_installments.py [rows]
+"""
+import re
+import sys
+import time
+import pandas as pd
+from synthetic import make_statement
+from utils import compact_transactions, merge_installments
+
+
+def legacy_merge_installments(df):
+    # The per-row regex implementation merge_installments replaced
+    def base_title(title):
+        match = re.match(r"(.+?)\s+Parcela\s+\d+/\d+", title, re.IGNORECASE)
+        return match.group(1).strip() if match else title.strip()
+
+    df = df.copy()
+    df['base_title'] = df['title'].apply(base_title)
+    df['is_parcela'] = df['title'].str.contains(r'Parcela \d+/\d+', case=False, regex=True)
+    parcela_df = df[df['is_parcela']]
+    non_parcela_df = df[~df['is_parcela']]
+    merged = parcela_df.groupby('base_title').agg({'amount': 'sum', 'date': 'min'}).reset_index()
+    merged['title'] = merged['base_title']
+    merged = merged[['date', 'title', 'amount']]
+    return pd.concat([non_parcela_df[['date', 'title', 'amount']], merged], ignore_index=True)
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    df = make_statement(rows)
+    legacy_time, legacy = timed(legacy_merge_installments, df)
+    new_time, merged = timed(merge_installments, compact_transactions(df))
+    assert len(legacy) == len(merged)
+    print(f"rows: {rows}")
+    print(f"legacy merge_installments: {legacy_time:.2f}s")
+    print(f"merge_installments:        {new_time:.2f}s")
+    print(f"speedup:                   {legacy_time / new_time:.1f}x")
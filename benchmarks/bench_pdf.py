@@ -0,0 +1,41 @@
+"""
+Time a large-report PDF export and report pages per second and how much
+the export raised the process's peak memory (Unix only), optionally
+against the regular single-table layout.
+
+Usage: PYTHONPATH=src python benchmarks/bench_pdf.py [rows] [--regular]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from synthetic import make_statement
+from aggregates import TransactionAggregates
+from categorizer import TransactionCategorizer
+from utils import compact_transactions, merge_installments, generate_pdf
+
+CATEGORIES_JSON = os.path.join(os.path.dirname(__file__), '..', 'src', 'categories.json')
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    rows = int(args[0]) if args else 1000000
+    large = '--regular' not in sys.argv
+    transactions = merge_installments(compact_transactions(make_statement(rows)), by_plan=True)
+    categorized = TransactionCategorizer(CATEGORIES_JSON).categorize_transactions(transactions)
+    aggregates = TransactionAggregates.from_frame(categorized)
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = os.path.join(directory, 'report.pdf')
+        # ru_maxrss is in KiB on Linux
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        pages = generate_pdf(pdf_path, categorized, max_workers=1, aggregates=aggregates, large=large)
+        seconds = time.perf_counter() - start
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        size = os.path.getsize(pdf_path)
+    print(f"rows:       {len(categorized)} ({'large-report' if large else 'regular'} mode)")
+    print(f"pages:      {pages}")
+    print(f"time:       {seconds:.1f}s ({pages / seconds:.1f} pages/s)")
+    print(f"peak RSS:   +{(rss_after - rss_before) / 2**10:.1f} MiB over loading ({rss_after / 2**10:.1f} MiB)")
+    print(f"file size:  {size / 2**20:.1f} MiB")
@@ -0,0 +1,167 @@
+"""
+Benchmark the load -> merge -> categorize -> render pipeline on synthetic
+statements and write the timings and peak memory of every stage to JSON.
+
+Usage: PYTHONPATH=src python benchmarks/bench_pipeline.py [--sizes 10000 100000 1000000]
+       [--output results.json] [--compare previous.json]
+
+Each stage is timed (best of --repeat runs) without tracing, then run once
+more under tracemalloc for its peak Python/NumPy allocation. generate_pdf
+lays out a page per ~36 transactions, so it is skipped above
+--pdf-max-rows; see bench_pdf.py for the 1M-row export.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from synthetic import make_statement
+from aggregates import TransactionAggregates
+from categorizer import TransactionCategorizer
+from title_index import TitleIndex
+from utils import read_csv, compact_transactions, merge_installments, generate_pdf
+
+CATEGORIES_JSON = os.path.join(os.path.dirname(__file__), '..', 'src', 'categories.json')
+
+
+def measure(func, repeat=1):
+    """Best wall time over repeat runs and the traced peak of one more run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak, result
+
+
+def summary_view(aggregates):
+    # What show_summary and the PDF summary table need
+    totals = aggregates.category_totals
+    return totals / totals.sum() * 100
+
+
+def stores_view(aggregates, top_n=30):
+    # What show_stores needs before drawing
+    return aggregates.top_merchants(top_n)
+
+
+def details_views(categorized, aggregates):
+    # Every Details page: its rows sorted by amount plus its chart series
+    for category in aggregates.category_totals.index:
+        rows = categorized.iloc[aggregates.category_rows(category)]
+        rows.sort_values(by='amount_cents', ascending=False)
+        aggregates.rollups.series(category, 'day')
+        aggregates.rollups.series(category, 'month')
+
+
+def search_index(categorized):
+    index = TitleIndex()
+    index.add(categorized['title'])
+    return index
+
+
+def run_size(rows, directory, repeat, pdf_max_rows, seed=0):
+    csv_path = os.path.join(directory, f'statement_{rows}.csv')
+    make_statement(rows, seed=seed).to_csv(csv_path, index=False)
+    results = []
+
+    def stage(name, func):
+        seconds, peak, result = measure(func, repeat)
+        results.append({'rows': rows, 'stage': name, 'seconds': round(seconds, 6), 'peak_bytes': peak})
+        print(f"{rows:>9} {name:<24} {seconds:9.3f}s {peak / 2**20:9.1f} MiB", flush=True)
+        return result
+
+    raw = stage('read_csv', lambda: read_csv(csv_path))
+    transactions = stage('compact_transactions', lambda: compact_transactions(raw))
+    merged = stage('merge_installments', lambda: merge_installments(transactions, by_plan=True))
+    # A fresh categorizer each run, so its title cache does not hide the matching
+    categorized = stage(
+        'categorize_transactions',
+        lambda: TransactionCategorizer(CATEGORIES_JSON).categorize_transactions(merged),
+    )
+    aggregates = stage('aggregates', lambda: TransactionAggregates.from_frame(categorized))
+    stage('summary_view', lambda: summary_view(aggregates))
+    stage('stores_view', lambda: stores_view(aggregates))
+    stage('details_views', lambda: details_views(categorized, aggregates))
+    stage('search_index', lambda: search_index(categorized))
+    if rows <= pdf_max_rows:
+        pdf_path = os.path.join(directory, f'report_{rows}.pdf')
+        stage('generate_pdf', lambda: generate_pdf(pdf_path, categorized, aggregates=aggregates))
+    else:
+        results.append({'rows': rows, 'stage': 'generate_pdf', 'seconds': None, 'peak_bytes': None, 'skipped': True})
+        print(f"{rows:>9} {'generate_pdf':<24} skipped (more than {pdf_max_rows} rows)", flush=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous_path):
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    before = {(r['rows'], r['stage']): r for r in previous['results']}
+    print(f"\nCompared with {previous.get('commit') or previous_path}:")
+    for result in results:
+        old = before.get((result['rows'], result['stage']))
+        if not old or not old.get('seconds') or not result.get('seconds'):
+            continue
+        print(
+            f"{result['rows']:>9} {result['stage']:<24} "
+            f"time {result['seconds'] / old['seconds']:6.2f}x  "
+            f"memory {result['peak_bytes'] / max(old['peak_bytes'], 1):6.2f}x"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pdf-max-rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='pipeline_results.json')
+    parser.add_argument('--compare', help='JSON written by an earlier run, e.g. on another commit')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.sizes:
+            results.extend(run_size(rows, directory, args.repeat, args.pdf_max_rows, args.seed))
+
+    report = {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Measure GUI startup with python -X importtime: the time to import app_ui,
+the slowest modules it pulls in, and whether any heavy library is loaded
+before the window shows.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+# Loaded on demand (first upload or export), never at startup
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'reportlab')
+
+
+def import_times(module='app_ui'):
+    """Self and cumulative import time in microseconds of every module imported."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app_ui import time.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help="write the measurements to this JSON file")
+    args = parser.parse_args(argv)
+
+    runs = [import_times() for _ in range(args.runs)]
+    totals = [times['app_ui'][1] for times in runs]
+    last = runs[-1]
+    heavy = sorted({name.split('.')[0] for name in last} & set(HEAVY_MODULES))
+    slowest = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+
+    print(f"import app_ui: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+    print(f"heavy modules loaded at startup: {', '.join(heavy) or 'none'}")
+    print("slowest modules (self time):")
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {name:<40} {self_us / 1000:8.1f} ms {cumulative_us / 1000:8.1f} ms cumulative")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'runs_us': totals,
+                'median_us': statistics.median(totals),
+                'heavy_modules': heavy,
+                'slowest': [{'module': name, 'self_us': s, 'cumulative_us': c} for name, (s, c) in slowest],
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
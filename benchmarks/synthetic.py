@@ -0,0 +1,104 @@
+"""
+Synthetic Nubank-style statements with Brazilian merchant titles, used by
+the benchmarks.
+"""
+import numpy as np
+import pandas as pd
+
+CITIES = [
+    "Sao Paulo", "Campinas", "Curitiba", "Belo Horizonte", "Porto Alegre", "Recife",
+    "Salvador", "Goiania", "Florianopolis", "Ribeirao Preto", "Sorocaba", "Santos",
+]
+
+NAMES = [
+    "Sao Joao", "Bom Gosto", "Da Praca", "Estrela", "Central", "Do Bairro", "Sabor Mineiro",
+    "Familia", "Pao Quente", "Aconchego", "Boa Vista", "Primavera", "Santa Luzia", "Jardim",
+]
+
+# Title templates and how often they appear; {n} is a store number
+MERCHANTS = [
+    ("Drogasil {n:04d}", 6),
+    ("Droga Raia {n:04d}", 5),
+    ("Pague Menos {n:03d}", 3),
+    ("Posto Ipiranga {city}", 6),
+    ("Posto Shell {n:03d}", 4),
+    ("Abastece Ai {city}", 2),
+    ("Estacionamento {name}", 2),
+    ("Ifood *{name}", 8),
+    ("Restaurante {name}", 5),
+    ("Lanchonete {name}", 4),
+    ("Burger King {n:04d}", 3),
+    ("Mcdonalds {city}", 3),
+    ("Padaria {name}", 6),
+    ("Supermercado Imperio {n:02d}", 4),
+    ("Assai Atacadista {city}", 5),
+    ("Mercado Delta {n:03d}", 3),
+    ("Lojas Americanas {n:04d}", 3),
+    ("Uber *Trip", 6),
+    ("99 *Pop", 3),
+    ("Netflix.Com", 1),
+    ("Youtube Premium", 1),
+    ("Google One", 1),
+    ("Apple.Com/Bill", 1),
+    ("Claro Celular", 1),
+    ("Vivo Fibra", 1),
+    ("Cinemark {city}", 1),
+    ("Renner {city}", 2),
+    ("Magazine Luiza", 2),
+    ("Mercadolivre*{name}", 5),
+    ("Shopee*{name}", 4),
+    ("Pag*{name}", 5),
+]
+
+
+def merchant_titles(count, seed=0):
+    """Distinct merchant titles, drawn from MERCHANTS by weight."""
+    rng = np.random.default_rng(seed)
+    templates = [template for template, _ in MERCHANTS]
+    weights = np.array([weight for _, weight in MERCHANTS], dtype=float)
+    titles = {}
+    for i in rng.choice(len(templates), size=count * 4, p=weights / weights.sum()):
+        title = templates[i].format(
+            n=int(rng.integers(1, 5000)),
+            city=CITIES[rng.integers(len(CITIES))],
+            name=NAMES[rng.integers(len(NAMES))],
+        )
+        titles[title] = None
+        if len(titles) == count:
+            break
+    return list(titles)
+
+
+def make_statement(rows, seed=0, merchants=20000, installment_rate=0.08, refund_rate=0.02, days=365):
+    """
+    A statement of rows transactions over days days, sorted by date, with
+    'Parcela X/Y' installments and negative refunds at the given rates and
+    a monthly 'Pagamento recebido' payment.
+    """
+    rng = np.random.default_rng(seed)
+    payments = pd.date_range('2025-01-10', periods=min(max(days // 30, 1), rows), freq='30D')
+    rows -= len(payments)
+    pool = np.array(merchant_titles(merchants, seed), dtype=object)
+    # A few merchants take most of the purchases, as in real statements
+    popularity = 1 / np.arange(1, len(pool) + 1) ** 0.8
+    titles = pool[rng.choice(len(pool), size=rows, p=popularity / popularity.sum())]
+    amounts = np.round(rng.lognormal(mean=3.8, sigma=0.9, size=rows), 2)
+
+    is_installment = rng.random(rows) < installment_rate
+    lengths = rng.integers(2, 13, rows)
+    indexes = rng.integers(0, 12, rows) % lengths + 1
+    titles[is_installment] = [
+        f"{title} Parcela {index}/{length}"
+        for title, index, length in zip(titles[is_installment], indexes[is_installment], lengths[is_installment])
+    ]
+    is_refund = ~is_installment & (rng.random(rows) < refund_rate)
+    amounts[is_refund] = -amounts[is_refund]
+
+    dates = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+    df = pd.DataFrame({
+        'date': np.concatenate([dates.to_numpy(), payments.to_numpy()]),
+        'title': np.concatenate([titles, np.full(len(payments), "Pagamento recebido", dtype=object)]),
+        'amount': np.concatenate([amounts, np.full(len(payments), -2500.0)]),
+    }).sort_values('date', kind='stable', ignore_index=True)
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    return df
@@ -0,0 +1,270 @@
+import numpy as np
+import pandas as pd
+from merchants import merchant_key
+from profiling import stage
+from rollups import CategoryRollups
+
+
+class TransactionAggregates:
+    """
+    Running totals over categorized transactions. Frames can be added in any
+    number of chunks and give the same totals as aggregating them at once.
+
+    Holds sums (in cents, so they are exact) and counts per category and day
+    and per store and category, from which category, store, daily and
+    monthly totals are derived; per-category series at any granularity come
+    from rollups. Stores are also grouped into merchants by
+    merchant_key(), worked out once per distinct title. Totals are reported
+    in currency units. With track_rows, it also keeps the positions of each
+    category's and each store's rows in the concatenation of every frame
+    added, so views can take their rows without rescanning the data. A
+    store's positions are kept in date order, so its drilldown needs no
+    sorting.
+    """
+
+    def __init__(self, track_rows=True):
+        # Sum and count per (category, date) and per (title, category)
+        self._days = None
+        self._stores = None
+        self.track_rows = track_rows
+        self.rows = 0
+        self._category_rows = {}
+        self._store_rows = {}
+        self._store_dates = {}  # Dates of each store's rows, in the same order
+        # Titles of each merchant, and the merchant of each title
+        self._merchant_titles = {}
+        self._title_merchants = {}
+        # Cached by merchants until new rows are added
+        self._merchants = None
+        # Cached by rollups until any category's totals change
+        self._rollups = None
+
+    @classmethod
+    def from_frame(cls, df):
+        aggregates = cls()
+        aggregates.update(df)
+        return aggregates
+
+    def update(self, df):
+        with stage('aggregate', rows=len(df)):
+            self._update(df)
+
+    def _update(self, df):
+        if self.track_rows:
+            self._add_rows(self._category_rows, df.groupby('category', observed=True).indices)
+            self._add_store_rows(df)
+            self.rows += len(df)
+        if df.empty:
+            return
+        self._add_merchants(df['title'].dropna().unique())
+        self._merchants = None
+        self._rollups = None
+        # Undated rows are kept (under NaT) so category totals include them
+        days = df.groupby(['category', 'date'], observed=True, dropna=False)['amount_cents'].agg(amount='sum', count='count')
+        stores = df.groupby(['title', 'category'], observed=True)['amount_cents'].agg(amount='sum', count='count')
+        self._days = self._combine(self._days, self._plain_levels(days))
+        self._stores = self._combine(self._stores, self._plain_levels(stores))
+
+    def recategorize(self, df, positions, categories):
+        """
+        Move the rows at positions of df, the frame these totals were built
+        from, to new categories. Only the totals of those rows are
+        subtracted from their old categories and added to the new ones.
+        """
+        with stage('aggregate_recategorize', rows=len(positions)):
+            self._recategorize(df, positions, categories)
+
+    def _recategorize(self, df, positions, categories):
+        if not len(positions):
+            return
+        self._rollups = None
+        old = df.iloc[positions][['date', 'title', 'category', 'amount_cents']]
+        new = old.assign(category=pd.Categorical(categories))
+        for keys, attr in ((['category', 'date'], '_days'), (['title', 'category'], '_stores')):
+            dropna = attr != '_days'
+            removed = self._plain_levels(
+                old.groupby(keys, observed=True, dropna=dropna)['amount_cents'].agg(amount='sum', count='count')
+            )
+            added = self._plain_levels(
+                new.groupby(keys, observed=True, dropna=dropna)['amount_cents'].agg(amount='sum', count='count')
+            )
+            totals = self._combine(getattr(self, attr), pd.concat([-removed, added]))
+            totals = totals[totals['count'] != 0]
+            setattr(self, attr, totals.set_axis(totals.index.remove_unused_levels()))
+        if self.track_rows:
+            positions = np.asarray(positions)
+            for category in old['category'].unique():
+                remaining = np.setdiff1d(self._category_rows[category], positions, assume_unique=True)
+                if len(remaining):
+                    self._category_rows[category] = remaining
+                else:
+                    del self._category_rows[category]
+            for category, indices in new.groupby('category', observed=True).indices.items():
+                moved = positions[indices]
+                if category in self._category_rows:
+                    # Disjoint, since these rows were in another category
+                    moved = np.sort(np.concatenate([self._category_rows[category], moved]))
+                self._category_rows[category] = moved
+
+    def _add_merchants(self, titles):
+        for title in titles:
+            if title not in self._title_merchants:
+                merchant = merchant_key(title)
+                self._title_merchants[title] = merchant
+                self._merchant_titles.setdefault(merchant, []).append(title)
+
+    def _add_store_rows(self, df):
+        dates = df['date'].to_numpy()
+        # Grouping the rows in date order keeps each store's positions in date order
+        order = np.argsort(dates, kind='stable')
+        titles = df['title'].iloc[order]
+        for title, indices in titles.groupby(titles, observed=True).indices.items():
+            positions = order[indices]
+            store_dates = dates[positions]
+            positions = positions + self.rows
+            if title in self._store_rows:
+                positions = np.concatenate([self._store_rows[title], positions])
+                store_dates = np.concatenate([self._store_dates[title], store_dates])
+                by_date = np.argsort(store_dates, kind='stable')
+                positions, store_dates = positions[by_date], store_dates[by_date]
+            self._store_rows[title] = positions
+            self._store_dates[title] = store_dates
+
+    def _add_rows(self, rows, indices):
+        for key, positions in indices.items():
+            positions = positions + self.rows
+            if key in rows:
+                positions = np.concatenate([rows[key], positions])
+            rows[key] = positions
+
+    @staticmethod
+    def _plain_levels(grouped):
+        # Categorical keys would make the index type depend on how rows were chunked
+        levels = [
+            level.astype(level.categories.dtype) if isinstance(level, pd.CategoricalIndex) else level
+            for level in grouped.index.levels
+        ]
+        return grouped.set_axis(grouped.index.set_levels(levels))
+
+    @staticmethod
+    def _combine(current, new):
+        if current is None:
+            return new
+        levels = list(range(new.index.nlevels))
+        return pd.concat([current, new]).groupby(level=levels, observed=True, dropna=False).sum()
+
+    @property
+    def category_totals(self):
+        if self._days is None:
+            return pd.Series(dtype=float, name='amount')
+        totals = self._days['amount'].groupby(level='category', observed=True).sum() / 100
+        return totals.sort_values(ascending=False)
+
+    @property
+    def stores(self):
+        if self._stores is None:
+            return pd.DataFrame(columns=['title', 'amount', 'count', 'mean'])
+        stores = self._stores.groupby(level='title', observed=True).sum().reset_index()
+        stores['amount'] = stores['amount'] / 100
+        stores['mean'] = stores['amount'] / stores['count']
+        return stores
+
+    @property
+    def merchants(self):
+        """
+        Sum, count, mean and number of distinct titles per merchant, in no
+        particular order. 'merchant' is the merchant_key() the titles share,
+        used for grouping and merchant_rows(); 'name' is its title with the
+        largest amount, for showing. Recategorizing does not change them, so
+        they are only recomputed after new rows are added.
+        """
+        if self._stores is None:
+            # Typed, so top_merchants() can still select from it
+            return pd.DataFrame({
+                'merchant': pd.Series([], dtype=object),
+                'name': pd.Series([], dtype=object),
+                'amount': pd.Series([], dtype=float),
+                'count': pd.Series([], dtype='int64'),
+                'mean': pd.Series([], dtype=float),
+                'titles': pd.Series([], dtype='int64'),
+            })
+        if self._merchants is None:
+            titles = self._stores.groupby(level='title', observed=True).sum()
+            grouped = titles.groupby(titles.index.map(self._title_merchants).rename('merchant'))
+            merchants = grouped.agg(amount=('amount', 'sum'), count=('count', 'sum'), titles=('count', 'size'))
+            merchants['name'] = grouped['amount'].idxmax()
+            merchants = merchants.reset_index()
+            merchants['amount'] = merchants['amount'] / 100
+            merchants['mean'] = merchants['amount'] / merchants['count']
+            self._merchants = merchants[['merchant', 'name', 'amount', 'count', 'mean', 'titles']]
+        return self._merchants
+
+    def top_merchants(self, n):
+        """
+        The n merchants with the largest totals, largest first, and the rest
+        (unsorted). Only the top n are ordered, so changing n is cheap.
+        """
+        merchants = self.merchants
+        top = merchants.nlargest(n, 'amount') if n > 0 else merchants.iloc[:0]
+        others = merchants.drop(index=top.index)
+        return top.reset_index(drop=True), others.reset_index(drop=True)
+
+    @property
+    def store_categories(self):
+        """Sum, count and mean per store and category."""
+        if self._stores is None:
+            return pd.DataFrame(columns=['title', 'category', 'amount', 'count', 'mean'])
+        stores = self._stores.reset_index()
+        stores['amount'] = stores['amount'] / 100
+        stores['mean'] = stores['amount'] / stores['count']
+        return stores
+
+    @property
+    def daily(self):
+        if self._days is None:
+            return pd.Series(dtype=float, name='amount', index=pd.DatetimeIndex([], name='date'))
+        return self._days['amount'].groupby(level='date').sum() / 100
+
+    @property
+    def monthly(self):
+        daily = self.daily
+        months = daily.index.to_period('M').astype(str)
+        return daily.groupby(months.rename('month')).sum()
+
+    def category_daily(self, category):
+        """Totals per day of a category, indexed by date in chronological order."""
+        try:
+            days = self._days.loc[category, 'amount']
+        except (AttributeError, KeyError):
+            # No data yet, or nothing in this category
+            return pd.Series(dtype=float, name='amount', index=pd.DatetimeIndex([]))
+        return days[days.index.notna()].sort_index() / 100
+
+    @property
+    def rollups(self):
+        """CategoryRollups of the daily totals, rebuilt only after they change."""
+        if self._rollups is None:
+            with stage('rollups', rows=0 if self._days is None else len(self._days)):
+                self._rollups = CategoryRollups(None if self._days is None else self._days['amount'])
+        return self._rollups
+
+    def category_rows(self, category):
+        """Positions of a category's rows, in the order they were added."""
+        return self._category_rows.get(category, np.array([], dtype=np.intp))
+
+    def store_rows(self, title):
+        """Positions of a store's rows, by date (rows of the same day in the order they were added)."""
+        return self._store_rows.get(title, np.array([], dtype=np.intp))
+
+    def merchant_rows(self, merchant):
+        """Positions of the rows of every title of a merchant, by date."""
+        return self.stores_rows(self._merchant_titles.get(merchant, []))
+
+    def stores_rows(self, titles):
+        """Positions of the rows of several stores, by date and then position."""
+        titles = [title for title in titles if title in self._store_rows]
+        if not titles:
+            return np.array([], dtype=np.intp)
+        positions = np.concatenate([self._store_rows[title] for title in titles])
+        dates = np.concatenate([self._store_dates[title] for title in titles])
+        return positions[np.lexsort((positions, dates))]
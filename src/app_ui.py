@@ -1,12 +1,64 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from categorizer import TransactionCategorizer
-from utils import read_csv, generate_pdf, merge_installments
+from tasks import BackgroundTask, format_progress
+from profiling import instrumented
 from tkinter import simpledialog
+import importlib
+import multiprocessing
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import threading
+
+# pandas, matplotlib, reportlab and the modules built on them are imported
+# where they are used, so the window shows before they are loaded
+
+def format_amount(value):
+    return f"{value:.2f}"
+
+def clear_widgets(container, keep=None):
+    """Destroy container's children except keep (a chart that is reused)."""
+    for widget in container.winfo_children():
+        if keep is None or str(widget) != str(keep.widget()):
+            widget.destroy()
+
+def store_table_model(stores):
+    from virtual_table import TableModel
+    return TableModel.from_frame(
+        stores,
+        {
+            'Store': 'name', 'Total Amount': 'amount', 'Transactions Count': 'count',
+            'Mean Amount': 'mean', 'Titles': 'titles',
+        },
+        formatters={
+            'Total Amount': format_amount, 'Transactions Count': lambda v: str(int(v)),
+            'Mean Amount': format_amount, 'Titles': lambda v: str(int(v)),
+        },
+    )
+
+# Imported in the background after startup, ahead of the first upload
+WARM_MODULES = (
+    'pandas', 'loader', 'categorizer', 'aggregates', 'title_index', 'virtual_table',
+    'statement_cache', 'matplotlib.figure', 'charts',
+)
+
+# How often categories.json is checked for edits
+CATEGORIES_POLL_MS = 2000
+
+# Stores shown individually in the Stores tab until the user changes it
+STORES_TOP_N = 30
+
+# Groupings of the Details charts; 'auto' is by month when several CSVs are
+# loaded and by day otherwise
+DETAILS_GRANULARITIES = ('auto', 'day', 'week', 'month', 'year')
+DETAILS_CHART_LABELS = {
+    'day': ("Spending Trend", "Date"),
+    'week': ("Weekly Spending Trend", "Week"),
+    'month': ("Monthly Spending Trend", "Month"),
+    'year': ("Yearly Spending Trend", "Year"),
+}
+
+def warm_imports():
+    for name in WARM_MODULES:
+        importlib.import_module(name)
 
 class CreditCardOrganizerApp(tk.Tk):
     def __init__(self):
@@ -17,6 +69,18 @@ class CreditCardOrganizerApp(tk.Tk):
         self.summary = None
         self.current_csvs = []  # Track current CSV file paths
         self.transactions_list = []  # Store all loaded DataFrames
+        self.max_workers = None  # Worker processes used to load CSVs (None = one per CPU)
+        self.load_task = None  # Background task running the load pipeline
+        self._statement_cache = None  # Parsed statements reused across launches
+        self.categorizer = None  # Categorizer of the current data, reused when appending
+        self.aggregates = None  # Running totals of categorized_transactions
+        self.installments = None  # Installment rows of all loaded CSVs
+        self.installment_plans = None
+        self.details_frames = {}  # Details notebook page per category
+        self.rendered_details = set()  # Categories whose page has been drawn
+        self.details_charts = {}  # Trend chart per category, kept across redraws
+        self.title_index = None  # Search index over the loaded titles
+        self.search_job = None  # Pending search while the user is typing
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill='both', expand=True)
@@ -25,6 +89,8 @@ class CreditCardOrganizerApp(tk.Tk):
         self.summary_tab = ttk.Frame(self.notebook)
         self.details_tab = ttk.Frame(self.notebook)
         self.stores_tab = ttk.Frame(self.notebook)  # New tab for stores
+        self.installments_tab = ttk.Frame(self.notebook)
+        self.search_tab = ttk.Frame(self.notebook)
 
         self.notebook.add(self.upload_tab, text='Upload CSV')
         # Do NOT add summary and details tabs here
@@ -33,16 +99,36 @@ class CreditCardOrganizerApp(tk.Tk):
         self.create_summary_tab()
         self.create_details_tab()
         self.create_stores_tab()  # Create stores tab
+        self.create_search_tab()
+        # Load pandas and friends while the user picks files
+        self.after(100, lambda: threading.Thread(target=warm_imports, daemon=True).start())
+        self.after(CATEGORIES_POLL_MS, self.watch_categories)
+
+    @property
+    def statement_cache(self):
+        if self._statement_cache is None:
+            from statement_cache import StatementCache
+            self._statement_cache = StatementCache()
+        return self._statement_cache
 
     def create_upload_tab(self):
         label = ttk.Label(self.upload_tab, text="Upload your credit card CSV file(s):")
         label.pack(pady=20)
         self.upload_btn = ttk.Button(self.upload_tab, text="Select CSV(s)", command=self.upload_csv)
         self.upload_btn.pack()
+        self.append_btn = ttk.Button(self.upload_tab, text="Append CSV(s)", command=self.append_csv)
+        self.append_btn.pack(pady=5)
+        self.append_btn.config(state=tk.DISABLED)
         self.clean_btn = ttk.Button(self.upload_tab, text="Clean Data", command=self.clean_data)
         self.clean_btn.pack(pady=5)
         self.clean_btn.config(state=tk.DISABLED)
+        self.reload_btn = ttk.Button(self.upload_tab, text="Reload Categories", command=self.reload_categories)
+        self.reload_btn.pack(pady=5)
+        self.reload_btn.config(state=tk.DISABLED)
         self.upload_btn.config(state=tk.NORMAL)
+        self.cancel_btn = ttk.Button(self.upload_tab, text="Cancel", command=self.cancel_upload)
+        self.clear_cache_btn = ttk.Button(self.upload_tab, text="Clear Cache", command=self.clear_cache)
+        self.clear_cache_btn.pack(side='bottom', pady=10)
         # Label to show current CSV files
         self.csv_label = ttk.Label(self.upload_tab, text="No CSV loaded.")
         self.csv_label.pack(pady=10)
@@ -51,7 +137,7 @@ class CreditCardOrganizerApp(tk.Tk):
         self.processing_label.pack(pady=5)
 
     def create_summary_tab(self):
-        self.summary_canvas = None
+        self.summary_chart = None  # Created on the first draw, then updated in place
         self.summary_table = None
         # Add Export button only once
         self.export_btn = ttk.Button(self.summary_tab, text="Export to PDF", command=self.export_pdf_dialog)
@@ -61,36 +147,159 @@ class CreditCardOrganizerApp(tk.Tk):
         self.summary_content.pack(fill='both', expand=True)
 
     def create_details_tab(self):
+        # Grouping and date range of the charts; changing them redraws only the charts
+        controls = ttk.Frame(self.details_tab)
+        controls.pack(fill='x', padx=10, pady=(10, 0))
+        self.details_granularity = tk.StringVar(value='auto')
+        self.details_start = tk.StringVar()
+        self.details_end = tk.StringVar()
+        ttk.Label(controls, text="Group by:").pack(side='left')
+        granularity = ttk.Combobox(
+            controls, textvariable=self.details_granularity, values=DETAILS_GRANULARITIES, state='readonly', width=8
+        )
+        granularity.bind('<<ComboboxSelected>>', lambda event: self.redraw_details_charts())
+        granularity.pack(side='left', padx=5)
+        for text, variable in (("From (YYYY-MM-DD):", self.details_start), ("To:", self.details_end)):
+            ttk.Label(controls, text=text).pack(side='left', padx=(10, 0))
+            entry = ttk.Entry(controls, textvariable=variable, width=11)
+            entry.bind('<Return>', lambda event: self.redraw_details_charts())
+            entry.pack(side='left', padx=5)
+
         self.details_notebook = ttk.Notebook(self.details_tab)
         self.details_notebook.pack(fill='both', expand=True)
+        # Category pages are drawn the first time they are selected
+        self.details_notebook.bind('<<NotebookTabChanged>>', lambda event: self.render_selected_details())
 
     def create_stores_tab(self):
-        self.stores_canvas = None
+        self.stores_chart = None
+        # How many stores to show; changing it only reselects the top ones
+        self.stores_top_n = tk.IntVar(value=STORES_TOP_N)
+        controls = ttk.Frame(self.stores_tab)
+        controls.pack(fill='x', padx=10, pady=(10, 0))
+        ttk.Label(controls, text="Stores shown:").pack(side='left')
+        spinbox = ttk.Spinbox(
+            controls, from_=1, to=1000, width=6, textvariable=self.stores_top_n, command=self.show_stores
+        )
+        spinbox.bind('<Return>', lambda event: self.show_stores())
+        spinbox.pack(side='left', padx=5)
         # Frame for store statistics
         self.stores_frame = ttk.Frame(self.stores_tab)
         self.stores_frame.pack(fill='both', expand=True)
 
+    def create_search_tab(self):
+        search_frame = ttk.Frame(self.search_tab)
+        search_frame.pack(fill='x', padx=10, pady=10)
+        ttk.Label(search_frame, text="Search transactions:").pack(side='left')
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.schedule_search)
+        ttk.Entry(search_frame, textvariable=self.search_var, width=40).pack(side='left', padx=5)
+        self.search_label = ttk.Label(search_frame, text="")
+        self.search_label.pack(side='left', padx=5)
+        self.search_table = None  # Created with the first results
+
     def upload_csv(self):
         file_paths = filedialog.askopenfilenames(filetypes=[("CSV Files", "*.csv")])
         if not file_paths:
             return
         self.current_csvs = list(file_paths)
+        self.update_csv_label()
+        from categorizer import TransactionCategorizer
+        categories_json_path = os.path.join(os.path.dirname(__file__), 'categories.json')
+        if os.path.exists(categories_json_path):
+            self.categorizer = TransactionCategorizer(categories_json_path)
+        else:
+            self.categorizer = TransactionCategorizer()
+        self.start_load(self.current_csvs, append=False)
+
+    def append_csv(self):
+        file_paths = filedialog.askopenfilenames(filetypes=[("CSV Files", "*.csv")])
+        if not file_paths:
+            return
+        self.start_load(list(file_paths), append=True)
+
+    def update_csv_label(self):
         self.csv_label.config(text=f"Current CSV(s): {', '.join([os.path.basename(f) for f in self.current_csvs])}")
+
+    def start_load(self, file_paths, append):
         self.processing_label.config(text="Processing...", foreground="blue")
+        categorizer = self.categorizer
+        max_workers = self.max_workers
+        cache = self.statement_cache
+        # Appended files are loaded alone; only their installments join the existing ones
+        previous_installments = self.installments if append else None
+
+        @instrumented('upload_csv', profile=True)
+        def run(progress):
+            import pandas as pd
+            from loader import load_statements
+            from utils import split_installments, installment_plans, concat_transactions
+            transactions_list, categorized = load_statements(
+                file_paths, categorizer, max_workers=max_workers, progress=progress, cache=cache, by_plan=True
+            )
+            progress("Analyzing installments")
+            _, installments = split_installments(concat_transactions(transactions_list))
+            if previous_installments is not None:
+                installments = pd.concat([previous_installments, installments], ignore_index=True)
+            return transactions_list, categorized, installments, installment_plans(installments)
+
+        # Read, merge and categorize off the Tk thread; poll for progress with after()
+        # Nothing may replace or clear the data until the task is done
+        for button in (self.upload_btn, self.append_btn, self.clean_btn, self.reload_btn, self.clear_cache_btn):
+            button.config(state=tk.DISABLED)
+        self.cancel_btn.pack(pady=5)
+        self.load_task = BackgroundTask(run).start()
+        self.after(100, self.poll_upload, file_paths, append)
+
+    def cancel_upload(self):
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.processing_label.config(text="Cancelling...", foreground="blue")
+
+    def poll_upload(self, file_paths, append):
+        task = self.load_task
+        if task is None:
+            return
+        for kind, payload in task.poll():
+            if kind == 'progress':
+                self.processing_label.config(text=format_progress(payload), foreground="blue")
+                continue
+            self.load_task = None
+            self.cancel_btn.pack_forget()
+            self.clear_cache_btn.config(state=tk.NORMAL)
+            if kind == 'done' and append:
+                self.append_loaded_data(file_paths, *payload)
+            elif kind == 'done':
+                self.show_loaded_data(*payload)
+            else:
+                if append:
+                    # The data loaded before the append is still there
+                    for button in (self.append_btn, self.clean_btn, self.reload_btn):
+                        button.config(state=tk.NORMAL)
+                else:
+                    self.current_csvs = []
+                    self.csv_label.config(text="No CSV loaded.")
+                    self.upload_btn.config(state=tk.NORMAL)
+                if kind == 'cancelled':
+                    self.processing_label.config(text="Upload cancelled.", foreground="blue")
+                else:
+                    self.processing_label.config(text="")
+                    messagebox.showerror("Error", f"Failed to process file(s): {payload}")
+            return
+        self.after(100, self.poll_upload, file_paths, append)
+
+    def show_loaded_data(self, transactions_list, categorized_transactions, installments, plans):
+        self.processing_label.config(text="Rendering charts...", foreground="blue")
         self.update_idletasks()
+        from aggregates import TransactionAggregates
+        from title_index import TitleIndex
         try:
-            self.transactions_list = []
-            for file_path in self.current_csvs:
-                transactions = read_csv(file_path)
-                self.transactions_list.append(transactions)
-            all_transactions = pd.concat(self.transactions_list, ignore_index=True)
-            all_transactions = merge_installments(all_transactions)
-            categories_json_path = os.path.join(os.path.dirname(__file__), 'categories.json')
-            if os.path.exists(categories_json_path):
-                categorizer = TransactionCategorizer(categories_json_path)
-            else:
-                categorizer = TransactionCategorizer()
-            self.categorized_transactions = categorizer.categorize_transactions(all_transactions)
+            self.transactions_list = transactions_list
+            self.categorized_transactions = categorized_transactions
+            self.aggregates = TransactionAggregates.from_frame(categorized_transactions)
+            self.title_index = TitleIndex()
+            self.title_index.add(categorized_transactions['title'])
+            self.installments = installments
+            self.installment_plans = plans
             # Add summary and details tabs if not present
             if self.summary_tab not in self.notebook.tabs():
                 self.notebook.add(self.summary_tab, text='Summary')
@@ -98,25 +307,110 @@ class CreditCardOrganizerApp(tk.Tk):
                 self.notebook.add(self.details_tab, text='Details')
             if self.stores_tab not in self.notebook.tabs():  # Check for stores tab
                 self.notebook.add(self.stores_tab, text='Stores')  # Add stores tab
+            if self.installments_tab not in self.notebook.tabs():
+                self.notebook.add(self.installments_tab, text='Installments')
+            if self.search_tab not in self.notebook.tabs():
+                self.notebook.add(self.search_tab, text='Search')
             self.show_summary()
             self.show_details()
             self.show_stores()  # Show stores data
+            self.show_installments()
+            self.refresh_search()
             self.notebook.select(self.summary_tab)
             self.processing_label.config(text="")  # Clear processing message
             self.clean_btn.config(state=tk.NORMAL)
-            self.upload_btn.config(state=tk.DISABLED)
+            self.append_btn.config(state=tk.NORMAL)
+            self.reload_btn.config(state=tk.NORMAL)
         except Exception as e:
             self.processing_label.config(text="")
+            self.upload_btn.config(state=tk.NORMAL)
             messagebox.showerror("Error", f"Failed to process file(s): {e}")
 
+    def append_loaded_data(self, file_paths, transactions_list, categorized_transactions, installments, plans):
+        """Fold newly loaded statements into the current data, refreshing only what they touch."""
+        self.processing_label.config(text="Rendering charts...", foreground="blue")
+        self.update_idletasks()
+        from utils import concat_transactions
+        try:
+            was_multiple = len(self.current_csvs) > 1
+            self.current_csvs.extend(file_paths)
+            self.update_csv_label()
+            self.transactions_list.extend(transactions_list)
+            self.categorized_transactions = concat_transactions(
+                [self.categorized_transactions, categorized_transactions]
+            )
+            self.aggregates.update(categorized_transactions)
+            self.title_index.add(categorized_transactions['title'])
+            self.installments = installments
+            self.installment_plans = plans
+            self.show_summary()
+            if was_multiple != (len(self.current_csvs) > 1):
+                # Charts switch from daily to monthly bars, so every category changes
+                self.show_details()
+            else:
+                self.update_details(set(categorized_transactions['category']))
+            self.show_stores()
+            self.show_installments()
+            self.refresh_search()
+            self.processing_label.config(text="")
+        except Exception as e:
+            self.processing_label.config(text="")
+            messagebox.showerror("Error", f"Failed to append file(s): {e}")
+        finally:
+            for button in (self.append_btn, self.clean_btn, self.reload_btn):
+                button.config(state=tk.NORMAL)
+
+    def clear_cache(self):
+        self.statement_cache.clear()
+        messagebox.showinfo("Cache", "Cached statements were removed.")
+
+    def watch_categories(self):
+        # A stat() of categories.json; only an actual edit triggers a reload
+        if self.categorized_transactions is not None and self.categorizer is not None and self.categorizer.source_changed():
+            self.reload_categories()
+        self.after(CATEGORIES_POLL_MS, self.watch_categories)
+
+    @instrumented('reload_categories')
+    def reload_categories(self):
+        """Apply edits to categories.json, recategorizing only the titles they can affect."""
+        if self.categorizer is None or self.categorized_transactions is None or self.load_task is not None:
+            return
+        from utils import set_categories
+        try:
+            changed = self.categorizer.reload()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to reload categories: {e}")
+            return
+        if changed is not None and not changed:
+            self.processing_label.config(text="Categories unchanged.", foreground="blue")
+            return
+        df = self.categorized_transactions
+        positions, categories = self.categorizer.recategorize(df, changed)
+        affected = set(df['category'].iloc[positions]) | set(categories)
+        self.aggregates.recategorize(df, positions, categories)
+        set_categories(df, positions, categories)
+        self.show_summary()
+        self.update_details(affected)
+        self.refresh_search()
+        self.processing_label.config(text=f"Categories reloaded: {len(positions)} transactions recategorized.", foreground="blue")
+
     def clean_data(self):
+        # A running load would later fold its result into the cleared data
+        if self.load_task is not None:
+            return
         # Remove data from memory
         self.categorized_transactions = None
         self.summary = None
         self.current_csvs = []
         self.transactions_list = []
+        self.aggregates = None
+        self.title_index = None
+        self.installments = None
+        self.installment_plans = None
+        self.show_details()
+        self.search_var.set("")
         # Remove summary and details tabs if present
-        for tab in [self.summary_tab, self.details_tab, self.stores_tab]:
+        for tab in [self.summary_tab, self.details_tab, self.stores_tab, self.installments_tab, self.search_tab]:
             try:
                 self.notebook.forget(tab)
             except tk.TclError:
@@ -125,36 +419,28 @@ class CreditCardOrganizerApp(tk.Tk):
         self.csv_label.config(text="No CSV loaded.")
         self.processing_label.config(text="")
         self.clean_btn.config(state=tk.DISABLED)
+        self.append_btn.config(state=tk.DISABLED)
+        self.reload_btn.config(state=tk.DISABLED)
         self.upload_btn.config(state=tk.NORMAL)
 
+    @instrumented('show_summary')
     def show_summary(self):
-        # Only clear dynamic content, not the export button
-        for widget in self.summary_content.winfo_children():
-            widget.destroy()
+        # Only clear dynamic content, not the export button or the chart
+        clear_widgets(self.summary_content, keep=self.summary_chart)
         if self.categorized_transactions is None:
             return
 
-        summary = self.categorized_transactions.groupby('category')['amount'].sum().reset_index()
-        summary = summary.sort_values(by='amount', ascending=False)
+        from charts import PieChart
+        summary = self.aggregates.category_totals.rename_axis('category').reset_index(name='amount')
         total = summary['amount'].sum()
         summary['percentage'] = (summary['amount'] / total * 100).round(2)
         self.summary = summary
 
         # Pie chart
-        fig, ax = plt.subplots(figsize=(4, 4))
-        ax.pie(
-            summary['amount'],
-            labels=summary['category'],
-            autopct='%1.0f%%',
-            startangle=90,
-            colors=plt.cm.Paired.colors
-        )
-        ax.set_title('Spending by Category')
-        plt.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=self.summary_content)
-        canvas.draw()
-        canvas.get_tk_widget().pack(pady=10)
-        plt.close(fig)
+        if self.summary_chart is None:
+            self.summary_chart = PieChart(self.summary_content, title='Spending by Category', figsize=(4, 4))
+            self.summary_chart.widget().pack(pady=10)
+        self.summary_chart.update(summary['amount'], summary['category'])
 
         # Table
         table_frame = ttk.Frame(self.summary_content)
@@ -169,148 +455,234 @@ class CreditCardOrganizerApp(tk.Tk):
         tree.insert('', 'end', values=('Total', f"{total:.2f}", '100%'))
         tree.pack(fill='x')
 
+    def multiple_csvs(self):
+        return len(self.current_csvs) > 1
+
     def show_details(self):
-        for tab in self.details_notebook.tabs():
-            self.details_notebook.forget(tab)
         if self.categorized_transactions is None or self.summary is None:
+            for frame in self.details_frames.values():
+                frame.destroy()
+            self.details_frames = {}
+            self.details_charts = {}
+            self.rendered_details = set()
             return
-        multiple_csvs = len(self.current_csvs) > 1
-        for category in self.summary['category']:
-            frame = ttk.Frame(self.details_notebook)
-            self.details_notebook.add(frame, text=category.capitalize())
-
-            cat_df = self.categorized_transactions[self.categorized_transactions['category'] == category]
-            cat_df = cat_df.sort_values(by='amount', ascending=False)
-
-            # Bar chart with trend line
-            if not cat_df.empty:
-                if multiple_csvs:
-                    # Group by month
-                    cat_df['month'] = pd.to_datetime(cat_df['date']).dt.to_period('M').astype(str)
-                    date_group = cat_df.groupby('month')['amount'].sum().reset_index()
-                    x_labels = date_group['month']
-                else:
-                    # Group by day
-                    date_group = cat_df.groupby('date')['amount'].sum().reset_index()
-                    date_group['date'] = pd.to_datetime(date_group['date'])
-                    date_group = date_group.sort_values('date')
-                    x_labels = date_group['date'].dt.strftime('%Y-%m-%d')
-
-                x = range(len(date_group))
-                y = date_group['amount'].values
-                if len(x) > 1:
-                    import numpy as np
-                    z = np.polyfit(x, y, 1)
-                    p = np.poly1d(z)
-                    trend = p(x)
-                else:
-                    trend = y
-
-                fig2, ax2 = plt.subplots(figsize=(5, 2.5))
-                ax2.bar(x_labels, y, color='skyblue', label='Amount')
-                ax2.plot(x_labels, trend, color='red', linewidth=2, label='Trend')
-                if multiple_csvs:
-                    ax2.set_title(f"Monthly Spending Trend for {category.capitalize()}")
-                    ax2.set_xlabel("Month")
-                else:
-                    ax2.set_title(f"Spending Trend for {category.capitalize()}")
-                    ax2.set_xlabel("Date")
-                ax2.set_ylabel("Amount")
-                ax2.tick_params(axis='x', rotation=45)
-                ax2.legend()
-                plt.tight_layout()
-                canvas2 = FigureCanvasTkAgg(fig2, master=frame)
-                canvas2.draw()
-                canvas2.get_tk_widget().pack(pady=10)
-                plt.close(fig2)
-
-            # Table of transactions
-            table_frame = ttk.Frame(frame)
-            table_frame.pack(fill='both', expand=True, padx=10, pady=10)
-            cols = ['Date', 'Title', 'Amount']
-            tree = ttk.Treeview(table_frame, columns=cols, show='headings', height=10)
-            for col in cols:
-                tree.heading(col, text=col)
-                tree.column(col, anchor='center')
-            for _, row in cat_df.iterrows():
-                tree.insert('', 'end', values=(row['date'], row['title'], f"{row['amount']:.2f}"))
-            tree.pack(fill='both', expand=True)
+        # Pages of categories that are still present are kept, with their charts
+        self.update_details(self.summary['category'])
+
+    def add_category_details(self, category):
+        # Empty placeholder page; filled in by render_selected_details()
+        frame = ttk.Frame(self.details_notebook)
+        self.details_notebook.add(frame, text=category.capitalize())
+        self.details_frames[category] = frame
+
+    def update_details(self, categories):
+        """Reset only the given categories' pages, adding pages for new ones and dropping emptied ones."""
+        current = set(self.summary['category'])
+        for category in list(self.details_frames):
+            if category not in current:
+                self.details_frames.pop(category).destroy()
+                self.details_charts.pop(category, None)
+                self.rendered_details.discard(category)
+        for category in categories:
+            if category not in current:
+                continue
+            frame = self.details_frames.get(category)
+            if frame is None:
+                self.add_category_details(category)
+                continue
+            clear_widgets(frame, keep=self.details_charts.get(category))
+            self.rendered_details.discard(category)
+        # Keep pages in the same order as the summary
+        for position, category in enumerate(self.summary['category']):
+            self.details_notebook.insert(position, self.details_frames[category])
+        self.render_selected_details()
+
+    def render_selected_details(self):
+        selected = self.details_notebook.select()
+        for category, frame in self.details_frames.items():
+            if str(frame) == selected:
+                if category not in self.rendered_details:
+                    self.rendered_details.add(category)
+                    self.render_category_details(category, frame)
+                return
 
+    @instrumented('render_category_details')
+    def render_category_details(self, category, frame):
+        from charts import TrendChart
+        from utils import format_cents, format_date
+        from virtual_table import TableModel, VirtualTable
+        cat_df = self.categorized_transactions.iloc[self.aggregates.category_rows(category)]
+        cat_df = cat_df.sort_values(by='amount_cents', ascending=False)
+
+        # Bar chart with trend line
+        if not cat_df.empty:
+            try:
+                start, end = self.details_range()
+            except ValueError:
+                start = end = None
+            if category not in self.details_charts:
+                chart = self.details_charts[category] = TrendChart(frame, figsize=(5, 2.5))
+                chart.widget().pack(pady=10)
+            self.draw_details_chart(category, start, end)
+
+        # Table of transactions
+        model = TableModel.from_frame(
+            cat_df,
+            {'Date': 'date', 'Title': 'title', 'Amount': 'amount_cents'},
+            formatters={'Date': format_date, 'Amount': format_cents},
+        )
+        table = VirtualTable(frame, model, height=10)
+        table.pack(fill='both', expand=True, padx=10, pady=10)
+
+    def details_range(self):
+        """The charts' date range as (start, end), None where left blank. Raises ValueError for bad dates."""
+        import pandas as pd
+        return tuple(
+            pd.Timestamp(text) if text else None
+            for text in (self.details_start.get().strip(), self.details_end.get().strip())
+        )
+
+    def draw_details_chart(self, category, start, end):
+        granularity = self.details_granularity.get()
+        if granularity == 'auto':
+            granularity = 'month' if self.multiple_csvs() else 'day'
+        # Answered from the precomputed running totals, without touching the rows
+        series = self.aggregates.rollups.series(category, granularity, start, end)
+        title, xlabel = DETAILS_CHART_LABELS[granularity]
+        self.details_charts[category].update(
+            list(series.index), series.to_numpy(), f"{title} for {category.capitalize()}", xlabel
+        )
+
+    @instrumented('redraw_details_charts')
+    def redraw_details_charts(self):
+        """Redraw the charts of the drawn Details pages with the chosen grouping and range."""
+        if self.aggregates is None:
+            return
+        try:
+            start, end = self.details_range()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid date: {e}")
+            return
+        for category in self.details_charts:
+            if category in self.rendered_details:
+                self.draw_details_chart(category, start, end)
+
+    @instrumented('show_stores')
     def show_stores(self):
-        for widget in self.stores_tab.winfo_children():
-            widget.destroy()
+        clear_widgets(self.stores_frame, keep=self.stores_chart)
         if self.categorized_transactions is None:
             return
+        import pandas as pd
+        from charts import PieChart
+        from virtual_table import VirtualTable
 
-        # Aggregate: sum, count, mean
-        stores = (
-            self.categorized_transactions
-            .groupby('title')
-            .agg(amount=('amount', 'sum'),
-                 count=('amount', 'count'),
-                 mean=('amount', 'mean'))
-            .reset_index()
-        )
-        stores = stores.sort_values(by='amount', ascending=False)
-        top_n = 30  # Show top 30 stores, group the rest as "Others"
-        if len(stores) > top_n:
-            top_stores = stores.iloc[:top_n]
-            others = pd.DataFrame([{
-                'title': 'Others',
-                'amount': stores.iloc[top_n:]['amount'].sum(),
-                'count': stores.iloc[top_n:]['count'].sum(),
-                'mean': stores.iloc[top_n:]['amount'].sum() / max(stores.iloc[top_n:]['count'].sum(), 1)
-            }])
-            stores = pd.concat([top_stores, others], ignore_index=True)
+        # Top merchants by amount, the rest grouped as "Others"
+        try:
+            top_n = max(self.stores_top_n.get(), 1)
+        except tk.TclError:
+            top_n = STORES_TOP_N
+        stores, others = self.aggregates.top_merchants(top_n)
+        if len(others):
+            # Always the last row; it has no merchant of its own
+            stores = pd.concat([stores, pd.DataFrame([{
+                'merchant': None,
+                'name': 'Others',
+                'amount': others['amount'].sum(),
+                'count': others['count'].sum(),
+                'mean': others['amount'].sum() / max(others['count'].sum(), 1),
+                'titles': others['titles'].sum(),
+            }])], ignore_index=True)
 
         # Pie chart
-        fig, ax = plt.subplots(figsize=(5, 5))
-        ax.pie(
-            stores['amount'],
-            labels=stores['title'],
-            autopct='%1.0f%%',
-            startangle=90,
-            colors=plt.cm.Paired.colors
+        if self.stores_chart is None:
+            self.stores_chart = PieChart(self.stores_frame, title='Amounts per Store', figsize=(5, 5))
+            self.stores_chart.widget().pack(pady=10)
+        self.stores_chart.update(stores['amount'], stores['name'])
+
+        # Double-click a store to see its transactions, or "Others" to list its stores
+        def on_store_double_click(row):
+            if len(others) and row == len(stores) - 1:
+                self.show_other_stores(others)
+                return
+            merchant = stores['merchant'].iloc[row]
+            self.show_store_transactions(stores['name'].iloc[row], self.aggregates.merchant_rows(merchant))
+
+        table = VirtualTable(self.stores_frame, store_table_model(stores), height=15, on_double_click=on_store_double_click)
+        table.pack(fill='x', padx=10, pady=10)
+
+    def show_other_stores(self, others):
+        """List the stores grouped under "Others", largest first."""
+        from virtual_table import VirtualTable
+        win = tk.Toplevel(self)
+        win.title(f"Other stores ({len(others)})")
+        win.geometry("600x400")
+        others = others.sort_values(by='amount', ascending=False, ignore_index=True)
+
+        def on_store_double_click(row):
+            merchant = others['merchant'].iloc[row]
+            self.show_store_transactions(others['name'].iloc[row], self.aggregates.merchant_rows(merchant))
+
+        table = VirtualTable(win, store_table_model(others), height=20, on_double_click=on_store_double_click)
+        table.pack(fill='both', expand=True, padx=10, pady=10)
+
+    @instrumented('show_installments')
+    def show_installments(self):
+        for widget in self.installments_tab.winfo_children():
+            widget.destroy()
+        if self.installment_plans is None:
+            return
+
+        # Partial plans first, largest amount still due on top
+        plans = self.installment_plans.sort_values(
+            by=['status', 'projected_amount'], ascending=[False, False]
+        )
+        partial = plans[plans['status'] == 'partial']
+        info = (
+            f"{len(plans)} installment plan(s): {len(plans) - len(partial)} complete, {len(partial)} partial. "
+            f"Projected future installments: {plans['projected_amount'].sum():.2f}"
         )
-        ax.set_title('Amounts per Store')
-        plt.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=self.stores_tab)
-        canvas.draw()
-        canvas.get_tk_widget().pack(pady=10)
-        plt.close(fig)
+        ttk.Label(self.installments_tab, text=info).pack(pady=10)
 
-        # Table
-        table_frame = ttk.Frame(self.stores_tab)
-        table_frame.pack(fill='x', padx=10, pady=10)
-        cols = ['Store', 'Total Amount', 'Transactions Count', 'Mean Amount']
-        tree = ttk.Treeview(table_frame, columns=cols, show='headings', height=15)
+        table_frame = ttk.Frame(self.installments_tab)
+        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        cols = ['Store', 'Purchase Month', 'Installments Seen', 'Amount Paid', 'Status', 'Remaining', 'Projected Amount']
+        tree = ttk.Treeview(table_frame, columns=cols, show='headings', height=10)
         for col in cols:
             tree.heading(col, text=col)
             tree.column(col, anchor='center')
-        for _, row in stores.iterrows():
+        for _, row in plans.iterrows():
             tree.insert(
                 '', 'end',
                 values=(
                     row['title'],
+                    row['purchase_month'],
+                    f"{int(row['paid'])}/{int(row['plan_length'])}",
                     f"{row['amount']:.2f}",
-                    int(row['count']),
-                    f"{row['mean']:.2f}"
+                    row['status'],
+                    int(row['remaining']),
+                    f"{row['projected_amount']:.2f}"
                 )
             )
-        tree.pack(fill='x')
-
-        # Bind double-click event
-        def on_store_double_click(event):
-            selected = tree.selection()
-            if not selected:
-                return
-            store = tree.item(selected[0])['values'][0]
-            if store == "Others":
-                messagebox.showinfo("Info", "Cannot show details for 'Others'.")
-                return
-            self.show_store_transactions(store)
-
-        tree.bind("<Double-1>", on_store_double_click)
+        tree.pack(fill='both', expand=True)
+
+        # Installments still due, soonest first
+        from utils import project_installments, format_date
+        from virtual_table import TableModel, VirtualTable
+        due = project_installments(plans).sort_values('date', kind='stable')
+        ttk.Label(self.installments_tab, text=f"{len(due)} installment(s) still due").pack(pady=(10, 0))
+        model = TableModel.from_frame(
+            due,
+            {
+                'Due Date': 'date', 'Store': 'title', 'Installment': 'installment',
+                'Plan Length': 'plan_length', 'Amount': 'amount',
+            },
+            formatters={
+                'Due Date': format_date, 'Installment': lambda v: str(int(v)),
+                'Plan Length': lambda v: str(int(v)), 'Amount': format_amount,
+            },
+        )
+        table = VirtualTable(self.installments_tab, model, height=10)
+        table.pack(fill='both', expand=True, padx=10, pady=10)
 
     def export_pdf_dialog(self):
         if self.categorized_transactions is None or self.summary is None:
@@ -328,21 +700,22 @@ class CreditCardOrganizerApp(tk.Tk):
         if not file_path:
             return
 
+        # reportlab is only loaded once a PDF is exported
+        from utils import generate_pdf
         if selected == "all":
-            generate_pdf(file_path, self.categorized_transactions)
+            generate_pdf(file_path, self.categorized_transactions, aggregates=self.aggregates)
             messagebox.showinfo("Exported", f"Exported all categories to {file_path}")
         else:
-            # Filter only selected categories
-            filtered = self.categorized_transactions[self.categorized_transactions['category'].isin(selected)]
-            generate_pdf(file_path, filtered)
+            # Only selected categories
+            generate_pdf(file_path, self.categorized_transactions, aggregates=self.aggregates, categories=selected)
             messagebox.showinfo("Exported", f"Exported selected categories to {file_path}")
 
     def generate_single_category_pdf(self, output_pdf, category, cat_df):
-        import matplotlib.pyplot as plt
         import io
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
         from reportlab.lib.styles import getSampleStyleSheet
         from reportlab.lib import colors
+        from utils import daily_totals, render_trend_chart, format_cents
 
         doc = SimpleDocTemplate(output_pdf)
         elements = []
@@ -351,40 +724,17 @@ class CreditCardOrganizerApp(tk.Tk):
 
         # Bar chart with trend line
         if not cat_df.empty:
-            date_group = cat_df.groupby('date')['amount'].sum().reset_index()
-            date_group['date'] = pd.to_datetime(date_group['date'])
-            date_group = date_group.sort_values('date')
-            x = range(len(date_group))
-            y = date_group['amount'].values
-            if len(x) > 1:
-                import numpy as np
-                z = np.polyfit(x, y, 1)
-                p = np.poly1d(z)
-                trend = p(x)
-            else:
-                trend = y
-
-            fig2, ax2 = plt.subplots(figsize=(5, 2.5))
-            formatted_dates = date_group['date'].dt.strftime('%Y-%m-%d')
-            ax2.bar(formatted_dates, y, color='skyblue', label='Amount')
-            ax2.plot(formatted_dates, trend, color='red', linewidth=2, label='Trend')
-            ax2.set_title(f"Spending Trend for {category.capitalize()}")
-            ax2.set_xlabel("Date")
-            ax2.set_ylabel("Amount")
-            ax2.tick_params(axis='x', rotation=45)
-            ax2.legend()
-            plt.tight_layout()
-            bar_buffer = io.BytesIO()
-            plt.savefig(bar_buffer, format='PNG')
-            plt.close(fig2)
-            bar_buffer.seek(0)
-            elements.append(Image(bar_buffer, width=350, height=150))
+            chart_png = render_trend_chart(category, *daily_totals(cat_df))
+            elements.append(Image(io.BytesIO(chart_png), width=350, height=150))
             elements.append(Spacer(1, 8))
 
         # Table of transactions
         trans_data = [['Date', 'Title', 'Amount']]
-        for _, row in cat_df.iterrows():
-            trans_data.append([row['date'], row['title'], f"{row['amount']:.2f}"])
+        trans_data.extend(zip(
+            cat_df['date'].dt.strftime('%Y-%m-%d'),
+            cat_df['title'],
+            map(format_cents, cat_df['amount_cents']),
+        ))
         trans_table = Table(trans_data, hAlign='LEFT')
         trans_table.setStyle(TableStyle([
             ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
@@ -394,24 +744,68 @@ class CreditCardOrganizerApp(tk.Tk):
         elements.append(trans_table)
         doc.build(elements)
 
-    def show_store_transactions(self, store_name):
+    def search_model(self, df):
+        import pandas as pd
+        from utils import format_cents, format_date
+        from virtual_table import TableModel
+        if df is None:
+            df = pd.DataFrame({'date': pd.DatetimeIndex([]), 'title': [], 'amount_cents': [], 'category': []})
+        return TableModel.from_frame(
+            df,
+            {'Date': 'date', 'Title': 'title', 'Amount': 'amount_cents', 'Category': 'category'},
+            formatters={'Date': format_date, 'Amount': format_cents},
+        )
+
+    def schedule_search(self, *args):
+        # Search once typing pauses rather than on every keystroke
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(150, self.refresh_search)
+
+    def refresh_search(self):
+        self.search_job = None
+        query = self.search_var.get()
+        if self.search_table is None:
+            if self.title_index is None:
+                return
+            from virtual_table import VirtualTable
+            self.search_table = VirtualTable(self.search_tab, self.search_model(None), height=20)
+            self.search_table.pack(fill='both', expand=True, padx=10, pady=10)
+        if self.title_index is None or not query.strip():
+            self.search_table.set_model(self.search_model(None))
+            self.search_label.config(text="")
+            return
+        # Matching titles come from the index and their rows from the aggregates
+        titles = self.title_index.search(query)
+        # Already in date order
+        df = self.categorized_transactions.iloc[self.aggregates.stores_rows(titles)]
+        self.search_table.set_model(self.search_model(df))
+        self.search_label.config(text=f"{len(df)} transactions in {len(titles)} stores")
+
+    def show_store_transactions(self, store_name, rows=None):
         win = tk.Toplevel(self)
         win.title(f"Transactions for {store_name}")
         win.geometry("600x400")
 
-        # Filter transactions for this store
-        df = self.categorized_transactions[self.categorized_transactions['title'] == store_name]
-        df = df.sort_values(by='date')
+        from utils import format_cents, format_date
+        from virtual_table import TableModel, VirtualTable
+
+        # Transactions for this store, or for the given rows
+        if rows is None:
+            rows = self.aggregates.store_rows(store_name)
+        # Rows come from the aggregates in date order
+        df = self.categorized_transactions.iloc[rows]
 
         # Table
-        cols = ['Date', 'Title', 'Amount', 'Category']
-        tree = ttk.Treeview(win, columns=cols, show='headings', height=20)
-        for col in cols:
-            tree.heading(col, text=col)
-            tree.column(col, anchor='center')
-        for _, row in df.iterrows():
-            tree.insert('', 'end', values=(row['date'], row['title'], f"{row['amount']:.2f}", row.get('category', '')))
-        tree.pack(fill='both', expand=True, padx=10, pady=10)
+        if 'category' not in df:
+            df = df.assign(category='')
+        model = TableModel.from_frame(
+            df,
+            {'Date': 'date', 'Title': 'title', 'Amount': 'amount_cents', 'Category': 'category'},
+            formatters={'Date': format_date, 'Amount': format_cents},
+        )
+        table = VirtualTable(win, model, height=20)
+        table.pack(fill='both', expand=True, padx=10, pady=10)
 
 class CategoryExportDialog(tk.Toplevel):
     def __init__(self, parent, categories):
@@ -463,5 +857,6 @@ class CategoryExportDialog(tk.Toplevel):
         self.destroy()
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     app = CreditCardOrganizerApp()
     app.mainloop()
\ No newline at end of file
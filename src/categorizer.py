@@ -1,12 +1,26 @@
 import pandas as pd
+import numpy as np
+import hashlib
 import json
 import os
+from collections import OrderedDict, namedtuple
+from matcher import KeywordMatcher, changed_keywords, contains_any
+from profiling import stage
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
 
 class TransactionCategorizer:
-    def __init__(self, categories_json_path=None):
-        if categories_json_path and os.path.exists(categories_json_path):
-            with open(categories_json_path, 'r', encoding='utf-8') as f:
-                self.category_keywords = json.load(f)
+    def __init__(self, categories_json_path=None, cache_size=100000, category_keywords=None, fuzzy_distance=0):
+        # Edits allowed when no keyword matches a title exactly (0 disables fuzzy matching)
+        self.fuzzy_distance = fuzzy_distance
+        self.categories_json_path = None
+        self._source_stat = None  # (mtime_ns, size) and digest of the file last read
+        self._source_digest = None
+        if category_keywords is not None:
+            self.category_keywords = category_keywords
+        elif categories_json_path and os.path.exists(categories_json_path):
+            self.categories_json_path = categories_json_path
+            self.category_keywords = self._read_source()
         else:
             self.category_keywords = {
                 'market': ['benedete', 'imperio', 'market', 'delta', 'assai', 'lojao', 'americanas'],
@@ -16,18 +30,173 @@ class TransactionCategorizer:
                 'automotive': ['posto', 'nutag', 'abastece', 'abasteceai', 'estacionamento', 'f park'],
                 'taxes': ['pagamento recebido', 'txentregvisto'],
             }
+        self.matcher = KeywordMatcher(self.category_keywords, max_distance=fuzzy_distance)
+        # LRU cache of title -> category shared by every batch categorized
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _read_source(self):
+        stat = os.stat(self.categories_json_path)
+        with open(self.categories_json_path, 'rb') as f:
+            data = f.read()
+        # Remember the file before parsing it, so a broken edit is reported once
+        self._source_stat = (stat.st_mtime_ns, stat.st_size)
+        self._source_digest = hashlib.sha256(data).hexdigest()
+        return json.loads(data.decode('utf-8'))
+
+    def source_changed(self):
+        """
+        Whether categories_json_path changed since it was read. Only a stat()
+        unless its mtime or size moved; then the contents are hashed, so
+        saving the file unchanged does not count.
+        """
+        if self.categories_json_path is None:
+            return False
+        try:
+            stat = os.stat(self.categories_json_path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self._source_stat:
+            return False
+        with open(self.categories_json_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if digest == self._source_digest:
+            self._source_stat = (stat.st_mtime_ns, stat.st_size)
+            return False
+        return True
+
+    def reload(self):
+        """
+        Switch to the keywords in categories_json_path if the file changed.
+        Returns what set_keywords() does, or an empty set if it did not change.
+        """
+        if not self.source_changed():
+            return set()
+        return self.set_keywords(self._read_source())
+
+    def set_keywords(self, category_keywords):
+        """
+        Replace the keywords, forgetting the cached categories they may
+        change. Returns the keywords whose category changed, or None if any
+        title may have changed category (see matcher.changed_keywords). With
+        fuzzy matching, a changed keyword can affect titles that do not
+        contain it, so any change returns None.
+        """
+        changed = changed_keywords(self.category_keywords, category_keywords, self.matcher.default)
+        if changed and self.fuzzy_distance:
+            changed = None
+        self.category_keywords = category_keywords
+        self.matcher = KeywordMatcher(category_keywords, self.matcher.default, self.fuzzy_distance)
+        if changed is None:
+            self._cache.clear()
+        elif changed:
+            cached = list(self._cache)
+            for title, stale in zip(cached, contains_any(cached, changed)):
+                if stale:
+                    del self._cache[title]
+        return changed
+
+    def recategorize(self, df, changed=None):
+        """
+        Find the rows of an already categorized frame whose category differs
+        under the current keywords. Only distinct titles containing one of
+        the changed keywords (all of them if changed is None) are matched
+        again. Returns the rows' positions and their new categories.
+        """
+        titles = df['title']
+        if isinstance(titles.dtype, pd.CategoricalDtype):
+            codes = titles.cat.codes.to_numpy()
+            uniques = titles.cat.categories.to_numpy(dtype=object)
+        else:
+            codes, uniques = pd.factorize(titles)
+        # Missing titles are categorized as empty ones
+        uniques = np.append(uniques, '')
+        codes = np.where(codes < 0, len(uniques) - 1, codes)
+        if changed is None:
+            candidates = np.ones(len(uniques), dtype=bool)
+        else:
+            candidates = contains_any(uniques, changed)
+        rows = np.flatnonzero(candidates[codes])
+        if not len(rows):
+            return rows, np.array([], dtype=object)
+        matched = self.matcher.match_many(pd.Series(uniques[candidates]))
+        self._remember(zip(uniques[candidates], matched))
+        new_categories = np.empty(len(uniques), dtype=object)
+        new_categories[candidates] = matched.to_numpy()
+        new = new_categories[codes[rows]]
+        old = df['category'].iloc[rows].to_numpy(dtype=object)
+        moved = new != old
+        return rows[moved], new[moved]
 
     def categorize_title(self, title):
-        title_lower = title.lower()
-        for category, keywords in self.category_keywords.items():
-            for keyword in keywords:
-                if keyword in title_lower:
-                    return category
-        return 'others'
+        return self.matcher.match(title)
+
+    def categorize_titles(self, titles):
+        """
+        Categorize a Series of titles, matching each distinct title only once
+        and reusing results cached from earlier batches. Returns a
+        Categorical Series.
+        """
+        with stage('categorize', rows=len(titles)):
+            return self._categorize_titles(titles)
+
+    def _categorize_titles(self, titles):
+        if isinstance(titles.dtype, pd.CategoricalDtype):
+            # The distinct titles are already known
+            titles = titles.cat.remove_unused_categories()
+            codes = titles.cat.codes.to_numpy()
+            uniques = titles.cat.categories.to_numpy(dtype=object)
+            if (codes < 0).any():
+                # Missing titles are categorized as empty ones
+                uniques = np.append(uniques, '')
+                codes = np.where(codes < 0, len(uniques) - 1, codes)
+        else:
+            codes, uniques = pd.factorize(titles.fillna(''))
+        categories = np.empty(len(uniques), dtype=object)
+        missing = []
+        for i, title in enumerate(uniques):
+            category = self._cache.get(title)
+            if category is None:
+                missing.append(i)
+            else:
+                self._cache.move_to_end(title)
+                categories[i] = category
+        self.cache_hits += len(uniques) - len(missing)
+        self.cache_misses += len(missing)
+        if missing:
+            found = self.matcher.match_many(pd.Series(uniques[missing]))
+            categories[missing] = found.values
+            self._remember(zip(uniques[missing], found))
+        # Map title codes to category codes without building a string per row
+        category_codes, names = pd.factorize(categories)
+        return pd.Series(pd.Categorical.from_codes(category_codes[codes], names), index=titles.index)
+
+    def _remember(self, items):
+        if self.cache_size <= 0:
+            return
+        for title, category in items:
+            self._cache[title] = category
+            self._cache.move_to_end(title)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def prime_cache(self, title_categories):
+        """Seed the cache with categories computed elsewhere, e.g. in a worker process."""
+        self._remember(title_categories.items())
+
+    def cache_info(self):
+        return CacheInfo(self.cache_hits, self.cache_misses, self.cache_size, len(self._cache))
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def categorize_transactions(self, df):
         # Remove negative amounts
-        df = df[df['amount'] >= 0].copy()
+        df = df[df['amount_cents'] >= 0].copy()
         # Categorize
-        df['category'] = df['title'].apply(self.categorize_title)
-        return df
\ No newline at end of file
+        df['category'] = self.categorize_titles(df['title'])
+        return df
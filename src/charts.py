@@ -0,0 +1,198 @@
+"""
+Charts that stay on screen between redraws.
+
+Each view owns one Figure (matplotlib.figure.Figure, not pyplot, so nothing
+is registered with a global figure manager) and one canvas for its whole
+lifetime. New data updates the existing artists in place; when the axes
+themselves do not change, only those artists are blitted over a cached
+background instead of redrawing the whole figure.
+"""
+import numpy as np
+from utils import MAX_CHART_TICKS, trend_line
+
+
+class ChartView:
+    """
+    A Figure and its canvas, kept across updates. The data artists are
+    animated: full draws leave them out and cache the rest as the
+    background, and refresh() then blits just the artists over it.
+    """
+
+    def __init__(self, master=None, figsize=(5, 2.5), canvas_factory=None):
+        from matplotlib.figure import Figure
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        if canvas_factory is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        else:
+            self.canvas = canvas_factory(self.figure)
+        self.artists = []
+        self.overlays = []  # Animated too, but always drawn after self.artists
+        self.full_draws = 0
+        self.blits = 0
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def widget(self):
+        return self.canvas.get_tk_widget()
+
+    def _on_draw(self, event):
+        # Also runs when Tk resizes the canvas, so the background stays current
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists + self.overlays:
+            self.figure.draw_artist(artist)
+
+    def _animate(self, artists):
+        for artist in artists:
+            artist.set_animated(True)
+            self.artists.append(artist)
+
+    def _remove(self, artists):
+        for artist in artists:
+            artist.remove()
+            self.artists.remove(artist)
+
+    def refresh(self, layout_changed=False):
+        """Show the updated artists, blitting them unless the axes changed."""
+        if layout_changed or self._background is None:
+            self.canvas.draw()
+            self.full_draws += 1
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_artists()
+            self.canvas.blit(self.figure.bbox)
+            self.blits += 1
+
+
+class PieChart(ChartView):
+    """Pie chart with percentage labels, like Axes.pie(autopct='%1.0f%%', startangle=90)."""
+
+    def __init__(self, master=None, title='', figsize=(4, 4), canvas_factory=None):
+        super().__init__(master, figsize, canvas_factory)
+        import matplotlib
+        self.colors = matplotlib.colormaps['Paired'].colors
+        self.ax.set_title(title)
+        self.ax.set_aspect('equal')
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+        self.ax.set_axis_off()
+        self.wedges = []
+        self.labels = []
+        self.percents = []
+        self._fitted = None  # Label texts and positions the layout was last fitted to
+
+    def _build(self, count):
+        from matplotlib.patches import Wedge
+        self._remove(self.wedges + self.labels + self.percents)
+        self.wedges = [
+            self.ax.add_patch(Wedge((0, 0), 1, 0, 0, facecolor=self.colors[i % len(self.colors)]))
+            for i in range(count)
+        ]
+        self.labels = [self.ax.text(0, 0, '', va='center') for _ in range(count)]
+        self.percents = [self.ax.text(0, 0, '', ha='center', va='center') for _ in range(count)]
+        self._animate(self.wedges + self.labels + self.percents)
+
+    def update(self, values, labels):
+        values = np.asarray(values, dtype=float)
+        labels = [str(label) for label in labels]
+        if len(values) != len(self.wedges):
+            self._build(len(values))
+        labels_changed = labels != [text.get_text() for text in self.labels]
+        total = values.sum()
+        fractions = values / total if total > 0 else np.zeros(len(values))
+        # Counter-clockwise from 12 o'clock
+        bounds = 90 + 360 * np.concatenate([[0], np.cumsum(fractions)])
+        for i, label in enumerate(labels):
+            theta1, theta2 = bounds[i], bounds[i + 1]
+            self.wedges[i].set_theta1(theta1)
+            self.wedges[i].set_theta2(theta2)
+            middle = np.deg2rad((theta1 + theta2) / 2)
+            x, y = np.cos(middle), np.sin(middle)
+            self.labels[i].set_position((1.1 * x, 1.1 * y))
+            self.labels[i].set_horizontalalignment('left' if x > 0 else 'right')
+            self.labels[i].set_text(label)
+            self.percents[i].set_position((0.6 * x, 0.6 * y))
+            self.percents[i].set_text(f"{fractions[i] * 100:1.0f}%")
+        # New or moved labels may need more room around the pie; otherwise
+        # only the artists change and this blits
+        fitted = (labels, [text.get_position() for text in self.labels])
+        layout_changed = fitted != self._fitted and (labels_changed or self._labels_clipped())
+        if layout_changed:
+            self._fit_labels()
+            self._fitted = fitted
+        self.refresh(layout_changed)
+
+    def _fit_labels(self):
+        # tight_layout() works from the current layout, so with many labels
+        # it can take another pass before they all fit
+        for _ in range(3):
+            self.figure.tight_layout()
+            if not self._labels_clipped():
+                break
+
+    def _labels_clipped(self):
+        renderer = self.canvas.get_renderer()
+        bounds = self.figure.bbox
+        for text in self.labels:
+            extent = text.get_window_extent(renderer)
+            if extent.x0 < bounds.x0 or extent.x1 > bounds.x1 or extent.y0 < bounds.y0 or extent.y1 > bounds.y1:
+                return True
+        return False
+
+
+class TrendChart(ChartView):
+    """Bar chart of amounts per period with a linear trend line."""
+
+    def __init__(self, master=None, figsize=(5, 2.5), canvas_factory=None):
+        super().__init__(master, figsize, canvas_factory)
+        from matplotlib.patches import Patch
+        self.bars = []
+        self.tick_labels = None
+        self.trend, = self.ax.plot([], [], color='red', linewidth=2, label='Trend', animated=True)
+        self.ax.set_ylabel("Amount")
+        legend = self.ax.legend(handles=[Patch(color='skyblue', label='Amount'), self.trend])
+        legend.set_animated(True)
+        # Bars are rebuilt when their count changes; these stay above them
+        self.overlays.extend([self.trend, legend])
+
+    def update(self, labels, values, title='', xlabel=''):
+        labels = list(labels)
+        values = np.asarray(values, dtype=float)
+        x = np.arange(len(values))
+        layout_changed = False
+        if title != self.ax.get_title() or xlabel != self.ax.get_xlabel():
+            self.ax.set_title(title)
+            self.ax.set_xlabel(xlabel)
+            layout_changed = True
+        if len(values) != len(self.bars):
+            self._remove(self.bars)
+            self.bars = list(self.ax.bar(x, values, color='skyblue'))
+            self._animate(self.bars)
+        else:
+            for bar, value in zip(self.bars, values):
+                bar.set_height(value)
+        if labels != self.tick_labels:
+            # Label at most MAX_CHART_TICKS bars, as in the PDF charts
+            step = -(-len(labels) // MAX_CHART_TICKS) or 1
+            self.ax.set_xticks(x[::step], labels[::step], rotation=45)
+            self.ax.set_xlim(-0.5, max(len(values), 1) - 0.5)
+            self.tick_labels = labels
+            layout_changed = True
+        trend = trend_line(values)
+        self.trend.set_data(x, trend)
+
+        # Rescale only when the data leaves the current range or shrinks
+        # well inside it; otherwise the axes stay as drawn and we can blit
+        low = min(values.min(initial=0), trend.min(initial=0)) * 1.05
+        high = max(values.max(initial=0), trend.max(initial=0)) * 1.05 or 1
+        bottom, top = self.ax.get_ylim()
+        if low < bottom or high > top or high < top / 2 or low > bottom / 2:
+            self.ax.set_ylim(low, high)
+            layout_changed = True
+        if layout_changed:
+            self.figure.tight_layout()
+        self.refresh(layout_changed)
@@ -0,0 +1,206 @@
+"""
+Headless batch mode: categorize statements and write reports without the GUI.
+
+Usage: python src/cli.py STATEMENTS... [--output-dir reports] [--workers N]
+
+STATEMENTS are CSV files, glob patterns (quote them, ** is recursive) or
+directories, searched recursively. Statements are grouped into cardholders
+by the directory holding them (or one per file with --group-by file), and
+each cardholder gets a categorized CSV and a PDF report in its own folder
+under --output-dir. With --stream, statements are read in chunks and only
+a summary of the totals per category is written, so exports too large to
+load fit in memory. Cardholders are processed in parallel worker
+processes. Nothing here imports tkinter or a GUI matplotlib backend.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from categorizer import TransactionCategorizer
+from loader import load_statements
+from statement_cache import StatementCache
+from streaming import stream_aggregates
+from utils import generate_pdf, write_csv, export_transactions
+import profiling
+
+DEFAULT_CATEGORIES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'categories.json')
+
+
+def find_statements(inputs):
+    """CSV paths named by files, glob patterns or directories, without duplicates."""
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(glob.escape(pattern), '**', '*.csv'), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        paths.extend(sorted(path for path in matches if os.path.isfile(path)))
+    unique = {}
+    for path in paths:
+        unique.setdefault(os.path.abspath(path), None)
+    return list(unique)
+
+
+def group_statements(paths, group_by='directory'):
+    """
+    Map each cardholder name to its statements. Names come from the
+    directory holding the statements, or from the file name with
+    group_by='file'; repeated names get a numeric suffix.
+    """
+    groups = {}
+    for path in paths:
+        key = os.path.splitext(path)[0] if group_by == 'file' else os.path.dirname(path)
+        groups.setdefault(key, []).append(path)
+    cardholders = {}
+    for key, statements in groups.items():
+        name = os.path.basename(key) or 'statements'
+        unique_name, n = name, 1
+        while unique_name in cardholders:
+            n += 1
+            unique_name = f"{name}_{n}"
+        cardholders[unique_name] = statements
+    return cardholders
+
+
+def write_summary(aggregates, csv_path):
+    """Write the total and percentage of each category, largest first."""
+    summary = aggregates.category_totals.rename_axis('category').reset_index(name='amount')
+    total = summary['amount'].sum()
+    summary['percentage'] = (summary['amount'] / total * 100).round(2)
+    write_csv(summary, csv_path)
+    return summary
+
+
+def stream_cardholder(name, paths, output_dir, categorizer, start):
+    """Aggregate one cardholder's statements chunk by chunk and write only their summary."""
+    aggregates = stream_aggregates(paths, categorizer, by_plan=True)
+    folder = os.path.join(output_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    csv_path = os.path.join(folder, f'{name}_summary.csv')
+    summary = write_summary(aggregates, csv_path)
+    return {
+        'cardholder': name,
+        'statements': len(paths),
+        'transactions': int(aggregates.stores['count'].sum()),
+        'total': summary['amount'].sum(),
+        'csv': csv_path,
+        'pdf': None,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def process_cardholder(name, paths, output_dir, category_keywords, pdf=True, cache_dir=None, fuzzy_distance=0,
+                       stream=False):
+    """Load, merge and categorize one cardholder's statements and write their reports."""
+    start = time.perf_counter()
+    categorizer = TransactionCategorizer(category_keywords=category_keywords, fuzzy_distance=fuzzy_distance)
+    if stream:
+        return stream_cardholder(name, paths, output_dir, categorizer, start)
+    cache = StatementCache(cache_dir) if cache_dir else None
+    _, categorized = load_statements(paths, categorizer, max_workers=1, cache=cache, by_plan=True)
+    folder = os.path.join(output_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    csv_path = os.path.join(folder, f'{name}_categorized.csv')
+    write_csv(export_transactions(categorized), csv_path)
+    pdf_path = None
+    if pdf:
+        pdf_path = os.path.join(folder, f'{name}_report.pdf')
+        # Cardholders already run in parallel, so charts render in-process
+        generate_pdf(pdf_path, categorized, max_workers=1)
+    return {
+        'cardholder': name,
+        'statements': len(paths),
+        'transactions': len(categorized),
+        'total': categorized['amount_cents'].sum() / 100,
+        'csv': csv_path,
+        'pdf': pdf_path,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def run_batch(cardholders, output_dir, category_keywords, max_workers=None, pdf=True, cache_dir=None, fuzzy_distance=0,
+              stream=False):
+    """
+    Process every cardholder, several at a time. Yields each one's summary
+    as it finishes, or {'cardholder': name, 'error': message} if it failed.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(cardholders)))
+    args = [
+        (name, paths, output_dir, category_keywords, pdf, cache_dir, fuzzy_distance, stream)
+        for name, paths in cardholders.items()
+    ]
+    if max_workers == 1:
+        for arg in args:
+            try:
+                yield process_cardholder(*arg)
+            except Exception as e:
+                yield {'cardholder': arg[0], 'error': str(e)}
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(process_cardholder, *arg): arg[0] for arg in args}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {'cardholder': futures[future], 'error': str(e)}
+
+
+def load_keywords(categories_path):
+    if categories_path and os.path.exists(categories_path):
+        with open(categories_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    # The categorizer's built-in categories
+    return TransactionCategorizer().category_keywords
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Categorize credit card statements and write CSV and PDF reports.")
+    parser.add_argument('statements', nargs='+', help="CSV files, glob patterns or directories")
+    parser.add_argument('-o', '--output-dir', default='reports')
+    parser.add_argument('-c', '--categories', default=DEFAULT_CATEGORIES, help="categories.json to use")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="cardholders processed at once (default: one per CPU)")
+    parser.add_argument('--group-by', choices=['directory', 'file'], default='directory')
+    parser.add_argument('--no-pdf', action='store_true', help="only write the categorized CSVs")
+    parser.add_argument('--cache', action='store_true', help="reuse parsed statements from the statement cache")
+    parser.add_argument('--stream', action='store_true', help="read statements in chunks and only write a summary per category")
+    parser.add_argument('--fuzzy', type=int, default=0, metavar='EDITS', help="let titles no keyword matches match a keyword this many typos away")
+    parser.add_argument('--profile', metavar='FILE', help="append stage timings to FILE (see profiling.py)")
+    parser.add_argument('--cprofile', metavar='DIR', help="write cProfile dumps of each PDF export to DIR")
+    args = parser.parse_args(argv)
+
+    if args.profile or args.cprofile:
+        profiling.enable(args.profile, args.cprofile)
+    paths = find_statements(args.statements)
+    if not paths:
+        print("No CSV statements found.", file=sys.stderr)
+        return 2
+    cardholders = group_statements(paths, args.group_by)
+    cache_dir = StatementCache().cache_dir if args.cache else None
+    failed = 0
+    for result in run_batch(
+        cardholders, args.output_dir, load_keywords(args.categories),
+        max_workers=args.workers, pdf=not args.no_pdf, cache_dir=cache_dir, fuzzy_distance=args.fuzzy,
+        stream=args.stream,
+    ):
+        if 'error' in result:
+            failed += 1
+            print(f"{result['cardholder']}: FAILED: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"{result['cardholder']}: {result['statements']} statement(s), "
+                f"{result['transactions']} transactions, total {result['total']:.2f} "
+                f"({result['seconds']:.1f}s)"
+            )
+    print(f"{len(cardholders) - failed} of {len(cardholders)} cardholder(s) written to {args.output_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from categorizer import TransactionCategorizer
+from utils import read_csv, compact_transactions, concat_transactions, merge_installments
+
+
+def load_file(file_path, categorizer, cache=None):
+    """
+    Parse one statement into the compact layout and categorize the titles it
+    contributes once its installments are merged. Returns the transactions
+    and a title to category mapping, served from cache when the file was
+    seen before.
+    """
+    if cache is not None:
+        key = cache.key(file_path, categorizer.category_keywords, categorizer.fuzzy_distance)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    transactions = compact_transactions(read_csv(file_path))
+    titles = pd.Series(merge_installments(transactions)['title'].unique().astype(object))
+    categories = categorizer.categorize_titles(titles)
+    title_categories = dict(zip(titles, categories))
+    if cache is not None:
+        cache.put(key, transactions, title_categories)
+    return transactions, title_categories
+
+
+def _load_file_worker(file_path, category_keywords, fuzzy_distance, cache):
+    categorizer = TransactionCategorizer(category_keywords=category_keywords, fuzzy_distance=fuzzy_distance)
+    return load_file(file_path, categorizer, cache)
+
+
+def _report(progress, *args, **kwargs):
+    if progress is not None:
+        progress(*args, **kwargs)
+
+
+def load_statements(file_paths, categorizer, max_workers=None, progress=None, cache=None, by_plan=False):
+    """
+    Load, merge and categorize several statements, parsing and categorizing
+    each file in its own worker process. Installments are merged across all
+    files afterwards, so the result is identical to loading them serially.
+
+    progress, if given, is called as progress(stage, current, total, rows)
+    between steps; an exception raised by it aborts the load. cache, if
+    given, is a StatementCache used to skip parsing unchanged files. by_plan
+    is passed on to merge_installments.
+
+    Returns the list of per-file DataFrames, in the layout of
+    compact_transactions, and the categorized DataFrame.
+    """
+    file_paths = list(file_paths)
+    total = len(file_paths)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, total)
+    results = [None] * total
+    rows = 0
+    _report(progress, "Reading files", 0, total, rows)
+    if max_workers <= 1:
+        for i, file_path in enumerate(file_paths):
+            results[i] = load_file(file_path, categorizer, cache)
+            rows += len(results[i][0])
+            _report(progress, "Reading files", i + 1, total, rows)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_load_file_worker, file_path, categorizer.category_keywords, categorizer.fuzzy_distance, cache): i
+                for i, file_path in enumerate(file_paths)
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    rows += len(future.result()[0])
+                    _report(progress, "Reading files", done, total, rows)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    if cache is not None:
+        cache.evict()
+
+    transactions_list = []
+    for transactions, title_categories in results:
+        transactions_list.append(transactions)
+        categorizer.prime_cache(title_categories)
+    all_transactions = concat_transactions(transactions_list)
+    _report(progress, "Merging installments", rows=len(all_transactions))
+    all_transactions = merge_installments(all_transactions, by_plan=by_plan)
+    _report(progress, "Categorizing", rows=len(all_transactions))
+    return transactions_list, categorizer.categorize_transactions(all_transactions)
+
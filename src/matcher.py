@@ -0,0 +1,191 @@
+import re
+import numpy as np
+import pandas as pd
+from merchants import fold_text
+
+# Shortest keyword the fuzzy fallback matches; shorter ones are too often
+# one edit away from an unrelated word
+FUZZY_MIN_LENGTH = 6
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyIndex:
+    """
+    Words within a bounded edit distance of a query. Every word is indexed
+    under each string left by deleting up to max_distance of its characters,
+    so a query looks up its own deletions instead of being compared with
+    every word, and only the words found are checked with edit_distance().
+    """
+
+    def __init__(self, words, max_distance=1):
+        self.max_distance = max_distance
+        self._deletions = {}
+        for word in dict.fromkeys(words):
+            for variant in self._variants(word):
+                self._deletions.setdefault(variant, set()).add(word)
+
+    def _variants(self, word):
+        variants = frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants = variants | frontier
+        return variants
+
+    def search(self, query):
+        """Words within max_distance of query, closest first."""
+        candidates = set()
+        for variant in self._variants(query):
+            candidates.update(self._deletions.get(variant, ()))
+        found = sorted((edit_distance(query, word, self.max_distance), word) for word in candidates)
+        return [word for distance, word in found if distance <= self.max_distance]
+
+
+class KeywordMatcher:
+    """
+    Matches titles against every category keyword with a single compiled regex.
+    The category listed first in the keyword mapping wins, just like a nested
+    loop over categories and keywords would. Titles and keywords are compared
+    after fold_text(), so case and accents do not matter.
+
+    With max_distance, titles no keyword matches fall back to fuzzy matching:
+    a word of the title within max_distance edits of a single-word keyword
+    (of at least FUZZY_MIN_LENGTH characters) counts as that keyword.
+    """
+
+    def __init__(self, category_keywords, default='others', max_distance=0):
+        self.categories = list(category_keywords)
+        self.default = default
+        self.max_distance = max_distance
+        # Each keyword belongs to the first category that lists it
+        self.ranks = {}
+        self.empty_rank = None
+        for rank, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                keyword = fold_text(keyword)
+                if keyword == '':
+                    if self.empty_rank is None:
+                        self.empty_rank = rank
+                elif keyword not in self.ranks:
+                    self.ranks[keyword] = rank
+        self.pattern = self._compile(self.ranks)
+        self.fuzzy = None
+        self._fuzzy_ranks = {}  # Best rank of each word looked up in self.fuzzy
+        if max_distance:
+            self.fuzzy = FuzzyIndex(
+                (keyword for keyword in self.ranks if ' ' not in keyword and len(keyword) >= FUZZY_MIN_LENGTH),
+                max_distance,
+            )
+
+    @staticmethod
+    def _compile(ranks):
+        # Group alternatives by first character so the regex engine only tries
+        # the keywords that can start at each position. Inside a group the
+        # alternatives keep rank order, so the first one to match at a
+        # position is also the best ranked one there.
+        groups = {}
+        for keyword in sorted(ranks, key=lambda k: (ranks[k], -len(k))):
+            groups.setdefault(keyword[0], []).append(keyword[1:])
+        if not groups:
+            return None
+        branches = []
+        for first, rests in groups.items():
+            alternatives = '|'.join(re.escape(rest) for rest in rests)
+            branches.append(f"{re.escape(first)}(?:{alternatives})")
+        # The lookahead makes findall report overlapping matches
+        return re.compile(f"(?=({'|'.join(branches)}))")
+
+    def match_rank(self, text):
+        """Rank of the best category for an already folded text, or None."""
+        best = self.empty_rank
+        if self.pattern is not None:
+            for keyword in self.pattern.findall(text):
+                rank = self.ranks[keyword]
+                if best is None or rank < best:
+                    best = rank
+                    if best == 0:
+                        break
+        if best is None and self.fuzzy is not None:
+            best = self._fuzzy_rank(text)
+        return best
+
+    def _fuzzy_rank(self, text):
+        best = None
+        for word in re.findall(r'\w+', text):
+            if len(word) < FUZZY_MIN_LENGTH - self.max_distance:
+                continue
+            if word not in self._fuzzy_ranks:
+                ranks = [self.ranks[keyword] for keyword in self.fuzzy.search(word)]
+                self._fuzzy_ranks[word] = min(ranks) if ranks else None
+            rank = self._fuzzy_ranks[word]
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return best
+
+    def match(self, title):
+        rank = self.match_rank(fold_text(title))
+        return self.default if rank is None else self.categories[rank]
+
+    def match_many(self, titles):
+        """
+        Categorize a whole Series of titles, keeping its index. Titles that
+        fold to the same text are matched once.
+        """
+        folded = [fold_text(title) for title in titles.fillna('').astype(str)]
+        codes, uniques = pd.factorize(pd.Series(folded, dtype=object))
+        labels = self.categories + [self.default]
+        missing = len(self.categories)
+        categories = np.array(
+            [labels[missing if rank is None else rank] for rank in map(self.match_rank, uniques)],
+            dtype=object,
+        )
+        return pd.Series(categories[codes], index=titles.index, dtype=object)
+
+
+def changed_keywords(old_keywords, new_keywords, default='others'):
+    """
+    Keywords whose category differs between two keyword mappings, or None
+    if any title may be affected. A title can only change category if it
+    contains one of the returned keywords: the other keywords keep their
+    category, and categories keep their relative priority. If categories
+    were reordered or the empty keyword moved, every title is affected.
+    """
+    old, new = KeywordMatcher(old_keywords, default), KeywordMatcher(new_keywords, default)
+    old_empty = None if old.empty_rank is None else old.categories[old.empty_rank]
+    new_empty = None if new.empty_rank is None else new.categories[new.empty_rank]
+    if old_empty != new_empty:
+        return None
+    old_categories, new_categories = set(old.categories), set(new.categories)
+    if [c for c in old.categories if c in new_categories] != [c for c in new.categories if c in old_categories]:
+        return None
+    old_owner = {keyword: old.categories[rank] for keyword, rank in old.ranks.items()}
+    new_owner = {keyword: new.categories[rank] for keyword, rank in new.ranks.items()}
+    return {
+        keyword for keyword in old_owner.keys() | new_owner.keys()
+        if old_owner.get(keyword) != new_owner.get(keyword)
+    }
+
+
+def contains_any(titles, keywords):
+    """Boolean array telling which titles contain any of keywords, ignoring case and accents."""
+    keywords = sorted({fold_text(keyword) for keyword in keywords} - {''}, key=len, reverse=True)
+    if not keywords:
+        return np.zeros(len(titles), dtype=bool)
+    search = re.compile('|'.join(re.escape(keyword) for keyword in keywords)).search
+    return np.fromiter(
+        (isinstance(title, str) and search(fold_text(title)) is not None for title in titles),
+        dtype=bool, count=len(titles),
+    )
@@ -0,0 +1,44 @@
+"""
+Normalization of the merchant names found in statement titles.
+
+fold_text() is what keywords are matched against: case and accents are
+folded, so 'Drogâsil' and 'DROGASIL' both contain 'drogasil' and the
+keyword 'calçado' matches 'Calcados Sao Joao'. merchant_key() goes further
+and reduces a title to its merchant, dropping card-processor prefixes,
+punctuation and trailing store numbers, so 'DROGASIL*123', 'Drogasil 04'
+and 'Drogâsil' are all 'drogasil'.
+"""
+import re
+import unicodedata
+
+# Card processors and marketplaces that prefix the merchant name with a
+# '*', as in 'IFD*Padaria Estrela' or 'PG *Loja X'
+PROCESSOR_PREFIXES = (
+    'ifd', 'ifood', 'pg', 'pag', 'pagseguro', 'mp', 'mercadopago', 'mercadolivre',
+    'ml', 'shopee', 'sumup', 'ebanx', 'paypal', 'pp', 'picpay', 'ec',
+)
+
+_PREFIX = re.compile(
+    r'^(?:%s)\s*\*\s*' % '|'.join(sorted(map(re.escape, PROCESSOR_PREFIXES), key=len, reverse=True))
+)
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+_STORE_NUMBER = re.compile(r'(?:\s+(?:loja|lj|filial|unidade|n|no)?\s*\d+)+$')
+
+
+def fold_text(text):
+    """Casefold, strip accents and collapse whitespace: 'Drogâsil  Centro' -> 'drogasil centro'."""
+    text = str(text).casefold()
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return ' '.join(text.split())
+
+
+def merchant_key(title):
+    """
+    The merchant a title refers to: folded, without a card-processor
+    prefix, punctuation or trailing store numbers. Titles that are only a
+    number keep it.
+    """
+    text = _PREFIX.sub('', fold_text(title))
+    text = ' '.join(_PUNCTUATION.sub(' ', text).split())
+    return _STORE_NUMBER.sub('', text) or text
@@ -0,0 +1,178 @@
+"""
+Opt-in instrumentation of the pipeline stages.
+
+Set CCO_PROFILE to a file path to have every stage append a JSON line with
+its wall time, rows processed and memory delta (traced with tracemalloc)
+to that file, and CCO_CPROFILE to a directory to get a cProfile dump of
+each whole load or PDF export. Both are off by default, in which case
+stage() returns a shared no-op object.
+
+Summarize a report with: python src/profiling.py report.jsonl
+"""
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+REPORT_ENV = 'CCO_PROFILE'
+CPROFILE_ENV = 'CCO_CPROFILE'
+
+_report_path = None
+_cprofile_dir = None
+_tracing = False  # Whether tracemalloc was started here
+_lock = threading.Lock()
+
+
+def enable(report_path=None, cprofile_dir=None):
+    """
+    Turn instrumentation on, or off when called without arguments. The
+    settings are also exported to the environment, so worker processes
+    started afterwards report too.
+    """
+    global _report_path, _cprofile_dir, _tracing
+    _report_path = os.path.abspath(report_path) if report_path else None
+    _cprofile_dir = os.path.abspath(cprofile_dir) if cprofile_dir else None
+    for name, value in ((REPORT_ENV, _report_path), (CPROFILE_ENV, _cprofile_dir)):
+        if value:
+            os.environ[name] = value
+        else:
+            os.environ.pop(name, None)
+    if _report_path and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracing = True
+    elif not _report_path and _tracing:
+        tracemalloc.stop()
+        _tracing = False
+
+
+def enabled():
+    return _report_path is not None
+
+
+def _write(record):
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _lock:
+        with open(_report_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+class _Stage:
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+
+    def add_rows(self, rows):
+        self.rows = (self.rows or 0) + rows
+
+    def __enter__(self):
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        _write({
+            'stage': self.name,
+            'seconds': round(seconds, 6),
+            'rows': self.rows,
+            'memory_delta': tracemalloc.get_traced_memory()[0] - self.memory,
+            'pid': os.getpid(),
+            'failed': exc_type is not None,
+        })
+        return False
+
+
+class _NullStage:
+    rows = None
+
+    def add_rows(self, rows):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, rows=None):
+    """
+    Context manager timing a stage. Rows not known up front can be added
+    with add_rows() on the object it returns.
+    """
+    if _report_path is None:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+@contextmanager
+def profiled(name):
+    """Write a cProfile dump of the block to the CCO_CPROFILE directory, if set."""
+    if _cprofile_dir is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        os.makedirs(_cprofile_dir, exist_ok=True)
+        profile.dump_stats(os.path.join(_cprofile_dir, f"{name}-{os.getpid()}-{time.time_ns()}.pstats"))
+
+
+def instrumented(name, profile=False):
+    """Decorator timing every call as a stage and, with profile, profiling it."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _report_path is None and not (profile and _cprofile_dir):
+                return func(*args, **kwargs)
+            with stage(name):
+                if not profile:
+                    return func(*args, **kwargs)
+                with profiled(name):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_report(report_path):
+    with open(report_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """Totals per stage, slowest first."""
+    stages = {}
+    for record in records:
+        total = stages.setdefault(record['stage'], {'stage': record['stage'], 'calls': 0, 'seconds': 0.0, 'rows': 0, 'memory_delta': 0})
+        total['calls'] += 1
+        total['seconds'] += record['seconds']
+        total['rows'] += record['rows'] or 0
+        total['memory_delta'] += record['memory_delta']
+    return sorted(stages.values(), key=lambda total: total['seconds'], reverse=True)
+
+
+def format_summary(totals):
+    lines = [f"{'stage':<28} {'calls':>6} {'seconds':>10} {'rows':>10} {'memory':>10}"]
+    for total in totals:
+        lines.append(
+            f"{total['stage']:<28} {total['calls']:>6} {total['seconds']:>10.3f} "
+            f"{total['rows']:>10} {total['memory_delta'] / 2**20:>8.1f}MB"
+        )
+    return '\n'.join(lines)
+
+
+enable(os.environ.get(REPORT_ENV), os.environ.get(CPROFILE_ENV))
+
+if __name__ == '__main__':
+    print(format_summary(summarize(read_report(sys.argv[1]))))
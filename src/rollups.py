@@ -0,0 +1,94 @@
+"""
+Per-category spending over time at any granularity and date range.
+
+The daily totals of every category are laid out on one calendar, from the
+first to the last day with transactions, and turned into running (prefix)
+sums. The total between any two days is then the difference of two
+entries, and a series of weekly or monthly totals is one subtraction per
+bar, whatever the number of transactions or the range asked for.
+"""
+import numpy as np
+import pandas as pd
+
+GRANULARITIES = ('day', 'week', 'month', 'year')
+_PERIODS = {'day': 'D', 'week': 'W', 'month': 'M', 'year': 'Y'}
+# Periods are labelled by their first day (weeks start on Monday)
+_LABELS = {'day': '%Y-%m-%d', 'week': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}
+
+
+class CategoryRollups:
+    """
+    Totals per category over any date range, at day, week, month or year
+    granularity. Built from amounts in cents indexed by (category, date),
+    as kept by TransactionAggregates; totals are reported in currency units.
+    Undated amounts have no place on the calendar and are left out.
+    """
+
+    def __init__(self, days=None):
+        if days is None:
+            days = pd.Series([], dtype='int64', index=pd.MultiIndex.from_arrays(
+                [pd.Index([], dtype=object), pd.DatetimeIndex([])], names=['category', 'date'],
+            ))
+        days = days[days.index.get_level_values('date').notna()]
+        codes, self.categories = pd.factorize(days.index.get_level_values('category'))
+        self._rows = {category: row for row, category in enumerate(self.categories)}
+        dates = pd.DatetimeIndex(days.index.get_level_values('date')).normalize()
+        if len(dates):
+            self.dates = pd.date_range(dates.min(), dates.max(), freq='D')
+        else:
+            self.dates = pd.DatetimeIndex([])
+        self._origin = self.dates[0] if len(self.dates) else pd.Timestamp(0)
+        offsets = (dates - self._origin).days.to_numpy()
+        daily = np.zeros((len(self.categories), len(self.dates)), dtype=np.int64)
+        np.add.at(daily, (codes, offsets), days.to_numpy(dtype=np.int64))
+        # _prefix[row, i] is the total of the first i days
+        self._prefix = np.zeros((len(self.categories), len(self.dates) + 1), dtype=np.int64)
+        np.cumsum(daily, axis=1, out=self._prefix[:, 1:])
+        # First day of each period, and its label, for every granularity
+        self._starts = {}
+        self._labels = {}
+        for granularity, freq in _PERIODS.items():
+            periods = self.dates.to_period(freq)
+            starts = np.concatenate([[0], np.flatnonzero(periods[1:] != periods[:-1]) + 1])[:len(periods)]
+            self._starts[granularity] = starts
+            self._labels[granularity] = periods[starts].start_time.strftime(_LABELS[granularity])
+
+    def _bounds(self, start, end):
+        # Half-open range of day offsets covering start..end (inclusive)
+        days = len(self.dates)
+        first = 0 if start is None else (pd.Timestamp(start).normalize() - self._origin).days
+        stop = days if end is None else (pd.Timestamp(end).normalize() - self._origin).days + 1
+        return min(max(first, 0), days), min(max(stop, 0), days)
+
+    def _prefix_row(self, category):
+        row = self._rows.get(category)
+        if row is None:
+            return np.zeros(len(self.dates) + 1, dtype=np.int64)
+        return self._prefix[row]
+
+    def total(self, category, start=None, end=None):
+        """Total of a category from start to end (inclusive; None for no limit)."""
+        first, stop = self._bounds(start, end)
+        if first >= stop:
+            return 0.0
+        prefix = self._prefix_row(category)
+        return (prefix[stop] - prefix[first]) / 100
+
+    def series(self, category, granularity='day', start=None, end=None):
+        """
+        Totals of a category per period from start to end (inclusive; None
+        for no limit), indexed by period label in chronological order.
+        Periods with no spending are included with 0, and periods cut by
+        the range only count the days inside it.
+        """
+        starts = self._starts[granularity]
+        first, stop = self._bounds(start, end)
+        if first >= stop:
+            return pd.Series([], dtype=float, name='amount', index=pd.Index([], name=granularity))
+        # Periods overlapping first..stop
+        low = np.searchsorted(starts, first, side='right') - 1
+        high = np.searchsorted(starts, stop, side='left')
+        edges = np.concatenate([[first], starts[low + 1:high], [stop]])
+        prefix = self._prefix_row(category)
+        values = (prefix[edges[1:]] - prefix[edges[:-1]]) / 100
+        return pd.Series(values, name='amount', index=pd.Index(self._labels[granularity][low:high], name=granularity))
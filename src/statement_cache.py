@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+
+# Bumped whenever the layout of cached transactions or the way titles are
+# categorized changes
+CACHE_VERSION = 4
+
+
+def default_cache_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'creditcard-organizer')
+
+
+def file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def keywords_digest(category_keywords):
+    # Category order decides which category wins, so it is part of the hash
+    payload = json.dumps(category_keywords, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class StatementCache:
+    """
+    Content-addressed cache of parsed statements and their title categories.
+
+    Entries are keyed by the CSV contents plus the active category keywords.
+    Each column is stored as a NumPy .npy file (text columns as integer codes
+    into a string table, -1 for missing), so a hit is a memory-mapped load
+    instead of a CSV parse; categorical columns are rebuilt straight from
+    their codes. Least recently used entries are evicted beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, file_path, category_keywords, fuzzy_distance=0):
+        fuzzy = f"-f{fuzzy_distance}" if fuzzy_distance else ""
+        return f"{file_digest(file_path)}-{keywords_digest(category_keywords)[:16]}{fuzzy}-v{CACHE_VERSION}"
+
+    def get(self, key):
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        columns = {}
+        for i, column in enumerate(meta['columns']):
+            values = np.load(os.path.join(entry, f'{i}.npy'), mmap_mode='r')
+            if column['dtype'] == 'category':
+                values = pd.Categorical.from_codes(np.asarray(values), column['strings'])
+            elif column['strings'] is not None:
+                # -1 picks the trailing None
+                values = np.array(column['strings'] + [None], dtype=object)[values]
+            columns[column['name']] = pd.Series(values, dtype=column['dtype'])
+        # Touch the entry so eviction sees it as recently used
+        os.utime(entry)
+        return pd.DataFrame(columns), meta['title_categories']
+
+    def put(self, key, transactions, title_categories):
+        entry = os.path.join(self.cache_dir, key)
+        if os.path.isdir(entry):
+            return
+        tmp = os.path.join(self.cache_dir, f'.tmp-{uuid.uuid4().hex}')
+        os.makedirs(tmp)
+        columns = []
+        for i, name in enumerate(transactions.columns):
+            series = transactions[name]
+            strings = None
+            if series.dtype.kind in 'biufcmM':
+                values = series.to_numpy()
+            else:
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+                else:
+                    codes, uniques = pd.factorize(series)
+                strings = [str(s) for s in uniques]
+                values = codes.astype(np.int32)
+            np.save(os.path.join(tmp, f'{i}.npy'), values)
+            columns.append({'name': name, 'dtype': str(series.dtype), 'strings': strings})
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'columns': columns, 'title_categories': title_categories}, f, ensure_ascii=False)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+            entries.append((os.stat(path).st_mtime, size, path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
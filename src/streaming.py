@@ -0,0 +1,46 @@
+import pandas as pd
+from aggregates import TransactionAggregates
+from utils import read_csv_chunks, compact_transactions, split_installments, group_installments, purchase_months
+
+PLAN_KEYS = ['title', 'plan_length', 'purchase']
+
+
+def _plan_totals(installments):
+    """Sum and earliest date per plan; partial totals can be combined again."""
+    if 'purchase' not in installments:
+        installments = installments.assign(purchase=purchase_months(installments))
+    return installments.groupby(PLAN_KEYS, dropna=False).agg(
+        date=('date', 'min'), amount_cents=('amount_cents', 'sum'),
+    ).reset_index()
+
+
+def stream_aggregates(file_paths, categorizer, chunksize=50000, by_plan=False):
+    """
+    Aggregate large statements without holding them in memory.
+
+    Each chunk is split into regular transactions, which are filtered,
+    categorized and folded into the running aggregates straight away, and
+    installments, which are reduced per base title (or per plan, with
+    by_plan, as merge_installments does) until every file has been read.
+    The result matches aggregating the fully loaded, merged and categorized
+    transactions.
+    """
+    reduce = _plan_totals if by_plan else group_installments
+    aggregates = TransactionAggregates(track_rows=False)
+    installments = None
+    for file_path in file_paths:
+        for chunk in read_csv_chunks(file_path, chunksize=chunksize):
+            regular, parcelas = split_installments(compact_transactions(chunk))
+            regular = regular[regular['amount_cents'] >= 0]
+            if not regular.empty:
+                aggregates.update(categorizer.categorize_transactions(regular))
+            if not parcelas.empty:
+                # Refunds still count towards an installment plan's total, so
+                # negatives are only dropped once the plan is merged
+                partial = reduce(parcelas)
+                if installments is not None:
+                    partial = reduce(pd.concat([installments, partial]))
+                installments = partial
+    if installments is not None:
+        aggregates.update(categorizer.categorize_transactions(installments[['date', 'title', 'amount_cents']]))
+    return aggregates
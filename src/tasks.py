@@ -0,0 +1,69 @@
+import queue
+import threading
+from collections import namedtuple
+
+ProgressEvent = namedtuple('ProgressEvent', ['stage', 'current', 'total', 'rows'])
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task once cancellation was requested."""
+
+
+class BackgroundTask:
+    """
+    Runs a function in a worker thread. The function receives a progress
+    callback; progress, completion and errors are queued as (kind, payload)
+    events that the UI thread drains with poll(), e.g. from Tk's after().
+    """
+
+    def __init__(self, target):
+        self.events = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def progress(self, stage, current=None, total=None, rows=None):
+        # Progress reports double as cancellation points
+        if self._cancel.is_set():
+            raise TaskCancelled()
+        self.events.put(('progress', ProgressEvent(stage, current, total, rows)))
+
+    def poll(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _run(self, target):
+        try:
+            result = target(self.progress)
+        except TaskCancelled:
+            self.events.put(('cancelled', None))
+        except Exception as e:
+            self.events.put(('error', e))
+        else:
+            self.events.put(('done', result))
+
+
+def format_progress(event):
+    text = event.stage
+    if event.total:
+        text += f" ({event.current} of {event.total})"
+    if event.rows is not None:
+        text += f" - {event.rows:,} rows"
+    return text + "..."
@@ -0,0 +1,58 @@
+import pandas as pd
+from merchants import fold_text
+
+
+def normalize_title(title):
+    """Fold case and accents and collapse whitespace for searching."""
+    return fold_text(title)
+
+
+class TitleIndex:
+    """
+    Substring search over the distinct transaction titles.
+
+    Each title is indexed by its character n-grams, so a query only checks
+    the titles sharing all of its n-grams instead of scanning every title.
+    Queries shorter than n fall back to a scan of the distinct titles, which
+    are far fewer than the rows they stand for.
+    """
+
+    def __init__(self, n=3):
+        self.n = n
+        self.titles = []
+        self._normalized = []
+        self._ids = {}
+        self._grams = {}
+
+    def _ngrams(self, text):
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, titles):
+        """Index the titles not seen before."""
+        for title in pd.Series(titles).unique():
+            if not isinstance(title, str) or title in self._ids:
+                continue
+            title_id = len(self.titles)
+            normalized = normalize_title(title)
+            self._ids[title] = title_id
+            self.titles.append(title)
+            self._normalized.append(normalized)
+            for gram in self._ngrams(normalized):
+                self._grams.setdefault(gram, set()).add(title_id)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def search(self, query):
+        """Titles containing the query, ignoring case and extra spaces, in the order they were added."""
+        query = normalize_title(query)
+        if not query:
+            return list(self.titles)
+        if len(query) < self.n:
+            return [title for title, normalized in zip(self.titles, self._normalized) if query in normalized]
+        postings = sorted((self._grams.get(gram, set()) for gram in self._ngrams(query)), key=len)
+        ids = postings[0].intersection(*postings[1:])
+        if len(query) > self.n:
+            # Sharing every n-gram does not guarantee they are contiguous
+            ids = [title_id for title_id in ids if query in self._normalized[title_id]]
+        return [self.titles[title_id] for title_id in sorted(ids)]
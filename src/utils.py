@@ -1,173 +1,547 @@
 import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import Table, TableStyle, SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 import io
+import os
 import numpy as np
 import re
+from pandas.api.types import union_categoricals
+from aggregates import TransactionAggregates
+from profiling import stage, instrumented
+
+# reportlab and matplotlib are imported inside the functions that draw, so
+# loading statements does not pay for them
+
+# Fewer charts than this render faster in-process than through a pool
+PARALLEL_CHART_THRESHOLD = 4
+# Most x-axis labels drawn on a PDF trend chart
+MAX_CHART_TICKS = 15
 
 def read_csv(file_path):
-    return pd.read_csv(file_path)
+    with stage('read_csv') as timing:
+        df = pd.read_csv(file_path)
+        timing.add_rows(len(df))
+    return df
+
+def read_csv_chunks(file_path, chunksize=50000):
+    return pd.read_csv(file_path, chunksize=chunksize)
+
+def compact_transactions(df):
+    """
+    Convert a statement as read from CSV to the compact in-memory layout used
+    everywhere else: date parsed once to datetime64, title as a Categorical
+    and the amount as int64 cents in amount_cents, so totals add up exactly.
+    Rows without an amount are dropped.
+    """
+    with stage('compact_transactions', rows=len(df)):
+        return _compact_transactions(df)
+
+def _compact_transactions(df):
+    amounts = pd.to_numeric(df['amount'])
+    has_amount = amounts.notna().to_numpy()
+    # Statements repeat dates and titles a lot, so each distinct one is converted once
+    date_codes, dates = pd.factorize(df['date'].to_numpy()[has_amount])
+    # Missing dates have code -1, which picks the trailing NaT
+    dates = np.append(pd.to_datetime(dates).to_numpy(), np.datetime64('NaT'))
+    title_codes, titles = pd.factorize(df['title'].to_numpy()[has_amount])
+    return pd.DataFrame({
+        'date': dates[date_codes],
+        'title': pd.Categorical.from_codes(title_codes, titles),
+        'amount_cents': np.round(amounts.to_numpy()[has_amount] * 100).astype('int64'),
+    })
+
+def export_transactions(df):
+    """Convert compact transactions back to the CSV layout: ISO dates and decimal amounts."""
+    exported = pd.DataFrame({
+        'date': df['date'].dt.strftime('%Y-%m-%d'),
+        'title': df['title'].astype(object),
+        'amount': df['amount_cents'] / 100,
+    })
+    for column in df.columns.difference(['date', 'title', 'amount_cents']):
+        exported[column] = df[column].astype(object)
+    return exported
+
+def set_categories(df, positions, categories):
+    """Set the category of the rows at positions, in place, keeping the column Categorical."""
+    categories = np.asarray(categories, dtype=object)
+    column = df['category'].astype('category')
+    column = column.cat.add_categories(pd.Index(pd.unique(categories)).difference(column.cat.categories))
+    codes = column.cat.codes.to_numpy().copy()
+    codes[positions] = column.cat.categories.get_indexer(categories)
+    column = pd.Categorical.from_codes(codes, column.cat.categories).remove_unused_categories()
+    df['category'] = pd.Series(column, index=df.index)
+
+def memory_usage(df):
+    """Bytes held by a DataFrame, including the strings it references."""
+    return int(df.memory_usage(deep=True).sum())
+
+def concat_transactions(frames):
+    """Concatenate transaction frames, keeping title and category categorical."""
+    frames = list(frames)
+    result = pd.concat(frames, ignore_index=True)
+    for column in ('title', 'category'):
+        if column in result:
+            result[column] = union_categoricals([
+                frame[column].astype('category').array for frame in frames
+            ], ignore_order=True)
+    return result
 
 def write_csv(dataframe, file_path):
     dataframe.to_csv(file_path, index=False)
 
 def filter_negative_transactions(transactions):
-    return transactions[transactions['amount'] >= 0]
+    return transactions[transactions['amount_cents'] >= 0]
 
-def generate_pdf(input_file, categorized_transactions):
-    output_pdf = input_file.replace('.csv', '.pdf')
-    # Sort summary by amount descending
-    summary = categorized_transactions.groupby('category')['amount'].sum().reset_index()
-    summary = summary.sort_values(by='amount', ascending=False)
-    total = summary['amount'].sum()
-    summary['percentage'] = (summary['amount'] / total * 100).round(2)
+def format_cents(cents):
+    return f"{cents / 100:.2f}"
 
-    # Prepare summary data for table
-    summary_data = [['Category', 'Sum of amount', 'Percentage']]
-    for _, row in summary.iterrows():
-        summary_data.append([
-            row['category'],
-            f"{row['amount']:.2f}",
-            f"{int(round(row['percentage']))}%"
-        ])
-    summary_data.append(['Total', f"{total:.2f}", '100%'])
+def format_date(date):
+    date = pd.Timestamp(date)
+    return '' if pd.isna(date) else date.strftime('%Y-%m-%d')
 
-    # Create pie chart using matplotlib
-    fig, ax = plt.subplots(figsize=(4, 4))
+def _figure_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='PNG')
+    return buffer.getvalue()
+
+@instrumented('render_chart')
+def render_pie_chart(summary):
+    """Render the category pie chart to PNG bytes."""
+    import matplotlib
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(4, 4))
+    ax = fig.subplots()
     ax.pie(
         summary['amount'],
         labels=summary['category'],
         autopct='%1.0f%%',
         startangle=90,
-        colors=plt.cm.Paired.colors
+        colors=matplotlib.colormaps['Paired'].colors
     )
     ax.set_title('Spending by Category')
-    plt.tight_layout()
+    fig.tight_layout()
+    return _figure_png(fig)
+
+def daily_totals(cat_df):
+    """Per-day totals of a category, sorted by date, as (labels, amounts)."""
+    date_group = cat_df.groupby('date')['amount_cents'].sum()
+    return list(date_group.index.strftime('%Y-%m-%d')), date_group.to_numpy() / 100
+
+def trend_line(values):
+    """Least-squares linear trend of values, evaluated at each position."""
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:
+        return values
+    x = np.arange(len(values))
+    return np.poly1d(np.polyfit(x, values, 1))(x)
+
+@instrumented('render_chart')
+def render_trend_chart(category, labels, values):
+    """
+    Render a category's bar chart with a linear trend line to PNG bytes.
+    Uses a standalone Figure on the Agg backend, so it is safe to call from
+    worker processes.
+    """
+    from matplotlib.figure import Figure
+    trend = trend_line(values)
+
+    fig = Figure(figsize=(5, 2.5))
+    ax = fig.subplots()
+    x = np.arange(len(labels))
+    ax.bar(x, values, color='skyblue', label='Amount')
+    ax.plot(x, trend, color='red', linewidth=2, label='Trend')
+    ax.set_title(f"Spending Trend for {category.capitalize()}")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Amount")
+    # Label at most MAX_CHART_TICKS bars; laying out a rotated label for
+    # every day of a long statement is most of the chart's cost
+    step = -(-len(labels) // MAX_CHART_TICKS) or 1
+    ax.set_xticks(x[::step], labels[::step], rotation=45)
+    ax.legend()
+    fig.tight_layout()
+    return _figure_png(fig)
+
+def render_trend_charts(charts, max_workers=None):
+    """
+    Render (category, labels, values) charts to PNG bytes, in input order.
+    Several charts are spread over a process pool.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(charts))
+    if max_workers <= 1 or len(charts) < PARALLEL_CHART_THRESHOLD:
+        return [render_trend_chart(*chart) for chart in charts]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(render_trend_chart, *zip(*charts)))
+
+class LazyFlowables:
+    """
+    The flowable list handed to doc.build(), filled from a generator as
+    reportlab consumes it. platypus only ever looks at the front of the
+    list, so just a few flowables are alive at a time and laid-out pages
+    can be freed, whatever the size of the report.
+    """
+    def __init__(self, flowables, lookahead=8):
+        self.head = []
+        self.pending = iter(flowables)
+        self.lookahead = lookahead
+
+    def _fill(self, count=None):
+        # None fills everything that is left
+        while self.pending is not None and (count is None or len(self.head) < count):
+            try:
+                self.head.append(next(self.pending))
+            except StopIteration:
+                self.pending = None
+
+    def __len__(self):
+        # A lower bound while the generator runs, but never 0 before the end
+        self._fill(self.lookahead)
+        return len(self.head)
+
+    def __getitem__(self, i):
+        # Slices come from handle_keepWithNext (flowables[:i]); ends counted
+        # from the back need the whole list
+        if isinstance(i, slice):
+            start, stop = i.start or 0, i.stop
+            self._fill(None if stop is None or stop < 0 or start < 0 else stop)
+        else:
+            self._fill(None if i < 0 else i + 1)
+        return self.head[i]
+
+    def __setitem__(self, i, value):
+        self.head[i] = value
+
+    def __delitem__(self, i):
+        del self.head[i]
+
+    def insert(self, i, value):
+        self.head.insert(i, value)
+
+def _compressed_page_canvas():
+    """
+    A reportlab Canvas class that deflates each page's content as soon as
+    the page is finished. reportlab otherwise keeps the content of every
+    page uncompressed until save(), so a long report's memory would grow
+    with its page count.
+    """
+    import zlib
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.pdfbase.pdfdoc import PDFDictionary, PDFName, PDFStream
+
+    class CompressedPageCanvas(Canvas):
+        def showPage(self):
+            super().showPage()
+            page = self._doc.Pages.pages[-1]
+            # A stream that already has a Filter is written as is
+            content = zlib.compress(page.stream.encode('utf8'))
+            page.Contents = PDFStream(PDFDictionary({'Filter': PDFName('FlateDecode')}), content)
+            page.stream = None
+
+    return CompressedPageCanvas
+
+# Reports with more transactions than this are written in large-report mode
+LARGE_REPORT_ROWS = 20000
+# Transaction rows per table in large-report mode; about one A4 page
+TABLE_CHUNK_ROWS = 36
+
+def _transaction_rows(dates, title_codes, titles, cents, positions):
+    """Date, title and amount cells of the given rows, built from column arrays."""
+    codes = title_codes[positions]
+    return list(zip(
+        np.datetime_as_string(dates[positions], unit='D'),
+        np.where(codes >= 0, titles.take(np.maximum(codes, 0)), ''),
+        map(format_cents, cents[positions]),
+    ))
+
+@instrumented('generate_pdf', profile=True)
+def generate_pdf(input_file, categorized_transactions, max_workers=None, aggregates=None, categories=None, large=None):
+    """
+    Write the PDF report and return its number of pages. aggregates, if
+    given, must be the TransactionAggregates of categorized_transactions
+    and saves regrouping the rows; categories restricts the report to those
+    categories.
+
+    In large-report mode (large=True, or by default above
+    LARGE_REPORT_ROWS transactions) transaction tables are split into
+    page-sized tables repeating their header, and flowables are created
+    only as reportlab lays them out, so memory does not grow with the
+    number of rows beyond the compressed pages themselves.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import Table, TableStyle, SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    output_pdf = input_file.replace('.csv', '.pdf')
+    if large is None:
+        large = len(categorized_transactions) > LARGE_REPORT_ROWS
+    if aggregates is None:
+        aggregates = TransactionAggregates.from_frame(categorized_transactions)
+    # Sort summary by amount descending
+    totals = aggregates.category_totals
+    if categories is not None:
+        totals = totals[totals.index.isin(categories)]
+    summary = totals.rename_axis('category').reset_index(name='amount')
+    total = summary['amount'].sum()
+    summary['percentage'] = (summary['amount'] / total * 100).round(2)
 
-    # Save pie chart to a BytesIO buffer
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='PNG')
-    plt.close(fig)
-    img_buffer.seek(0)
+    # Prepare summary data for table
+    summary_data = [['Category', 'Sum of amount', 'Percentage']]
+    summary_data.extend(
+        [category, f"{amount:.2f}", f"{int(round(percentage))}%"]
+        for category, amount, percentage in zip(summary['category'], summary['amount'], summary['percentage'])
+    )
+    summary_data.append(['Total', f"{total:.2f}", '100%'])
+
+    # Rows of each category, sorted by amount
+    cents = categorized_transactions['amount_cents'].to_numpy()
+    dates = categorized_transactions['date'].to_numpy()
+    title_column = categorized_transactions['title'].astype('category')
+    title_codes = title_column.cat.codes.to_numpy()
+    titles = title_column.cat.categories.to_numpy(dtype=object)
+    category_positions = []
+    charts = []
+    for category in summary['category']:
+        positions = aggregates.category_rows(category)
+        positions = positions[np.argsort(-cents[positions], kind='stable')]
+        category_positions.append((category, positions))
+        if len(positions):
+            days = aggregates.category_daily(category)
+            charts.append((category, list(days.index.strftime('%Y-%m-%d')), days.to_numpy()))
+
+    # Render every chart up front, the per-category ones in parallel
+    pie_png = render_pie_chart(summary)
+    with stage('render_pdf_charts', rows=len(charts)):
+        chart_pngs = iter(render_trend_charts(charts, max_workers=max_workers))
 
     # Create PDF
     doc = SimpleDocTemplate(output_pdf, pagesize=A4)
-    elements = []
     styles = getSampleStyleSheet()
-    elements.append(Paragraph("Summary by Category", styles['Title']))
-
-    # Add pie chart image
-    img = Image(img_buffer, width=200, height=200)
-    elements.append(img)
-    elements.append(Spacer(1, 12))
-
-    # Add summary table
-    t = Table(summary_data, hAlign='LEFT')
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-        ('ALIGN', (1,1), (-1,-1), 'RIGHT'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-2), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 1, colors.grey),
-        ('BACKGROUND', (0,-1), (-1,-1), colors.lightblue),
-    ]))
-    elements.append(t)
-    elements.append(PageBreak())
-
-    # Transactions by category (sorted by amount)
-    elements.append(Paragraph("Transactions by Category", styles['Title']))
-    for category in summary['category']:
-        elements.append(Paragraph(f"<b>{category.capitalize()}</b>", styles['Heading2']))
-        cat_df = categorized_transactions[categorized_transactions['category'] == category]
-        # Sort transactions in this category by amount descending
-        cat_df = cat_df.sort_values(by='amount', ascending=False)
-
-        # --- Bar chart with trend line for this category ---
-        if not cat_df.empty:
-            # Group by date and sum
-            date_group = cat_df.groupby('date')['amount'].sum().reset_index()
-            # Sort by date
-            date_group['date'] = pd.to_datetime(date_group['date'])
-            date_group = date_group.sort_values('date')
-            # Prepare data
-            x = np.arange(len(date_group))
-            y = date_group['amount'].values
-            # Trend line
-            if len(x) > 1:
-                z = np.polyfit(x, y, 1)
-                p = np.poly1d(z)
-                trend = p(x)
-            else:
-                trend = y
-
-            # Plot
-            fig2, ax2 = plt.subplots(figsize=(5, 2.5))
-            formatted_dates = date_group['date'].dt.strftime('%Y-%m-%d')
-            ax2.bar(formatted_dates, y, color='skyblue', label='Amount')
-            ax2.plot(formatted_dates, trend, color='red', linewidth=2, label='Trend')
-            ax2.set_title(f"Spending Trend for {category.capitalize()}")
-            ax2.set_xlabel("Date")
-            ax2.set_ylabel("Amount")
-            ax2.tick_params(axis='x', rotation=45)
-            ax2.legend()
-            plt.tight_layout()
-
-            # Save to buffer
-            bar_buffer = io.BytesIO()
-            plt.savefig(bar_buffer, format='PNG')
-            plt.close(fig2)
-            bar_buffer.seek(0)
-            elements.append(Image(bar_buffer, width=350, height=150))
-            elements.append(Spacer(1, 8))
-
-        # --- Transactions table ---
-        trans_data = [['Date', 'Title', 'Amount']]
-        for _, row in cat_df.iterrows():
-            trans_data.append([row['date'], row['title'], f"{row['amount']:.2f}"])
-        trans_table = Table(trans_data, hAlign='LEFT')
-        trans_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('ALIGN', (2,1), (2,-1), 'RIGHT'),
+    trans_style = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('ALIGN', (2,1), (2,-1), 'RIGHT'),
+    ])
+
+    def flowables():
+        yield Paragraph("Summary by Category", styles['Title'])
+
+        # Add pie chart image
+        yield Image(io.BytesIO(pie_png), width=200, height=200)
+        yield Spacer(1, 12)
+
+        # Add summary table
+        t = Table(summary_data, hAlign='LEFT')
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+            ('ALIGN', (1,1), (-1,-1), 'RIGHT'),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0,0), (-1,0), 12),
+            ('BACKGROUND', (0,1), (-1,-2), colors.whitesmoke),
+            ('GRID', (0,0), (-1,-1), 1, colors.grey),
+            ('BACKGROUND', (0,-1), (-1,-1), colors.lightblue),
         ]))
-        elements.append(trans_table)
-        elements.append(Spacer(1, 12))
-    doc.build(elements)
+        yield t
+        yield PageBreak()
+
+        # Transactions by category (sorted by amount)
+        yield Paragraph("Transactions by Category", styles['Title'])
+        for category, positions in category_positions:
+            yield Paragraph(f"<b>{category.capitalize()}</b>", styles['Heading2'])
+
+            # --- Bar chart with trend line for this category ---
+            if len(positions):
+                yield Image(io.BytesIO(next(chart_pngs)), width=350, height=150)
+                yield Spacer(1, 8)
+
+            # --- Transactions table ---
+            if not large:
+                trans_data = [['Date', 'Title', 'Amount']]
+                trans_data.extend(_transaction_rows(dates, title_codes, titles, cents, positions))
+                trans_table = Table(trans_data, hAlign='LEFT')
+                trans_table.setStyle(trans_style)
+                yield trans_table
+            else:
+                # Page-sized tables with fixed columns, so pages line up and
+                # no table has to be split row by row
+                for start in range(0, max(len(positions), 1), TABLE_CHUNK_ROWS):
+                    trans_data = [['Date', 'Title', 'Amount']]
+                    trans_data.extend(_transaction_rows(
+                        dates, title_codes, titles, cents, positions[start:start + TABLE_CHUNK_ROWS]
+                    ))
+                    trans_table = Table(trans_data, colWidths=(70, 320, 80), repeatRows=1, hAlign='LEFT')
+                    trans_table.setStyle(trans_style)
+                    yield trans_table
+            yield Spacer(1, 12)
 
-def merge_installments(df):
+    with stage('pdf_build', rows=len(categorized_transactions)):
+        if large:
+            doc.build(LazyFlowables(flowables()), canvasmaker=_compressed_page_canvas())
+        else:
+            doc.build(list(flowables()))
+    return doc.page
+
+# Base title, installment index and plan length of 'Parcela X/Y' titles
+INSTALLMENT_PATTERN = re.compile(r"(?:(?P<base>.+?)\s+)?Parcela\s+(?P<index>\d+)/(?P<total>\d+)", re.IGNORECASE)
+
+def extract_installments(titles):
     """
-    Merge transactions with 'Parcela X/Y' in the title, summing their amounts.
-    Keeps other transactions unchanged.
+    Extract base title, installment index and plan length in a single regex
+    pass. The pattern runs once per distinct title and the result is
+    broadcast back, so repeated titles cost nothing. index and total are
+    numeric; rows without a 'Parcela X/Y' counter get NaN in every column.
+    """
+    codes, uniques = pd.factorize(titles, use_na_sentinel=False)
+    bases = np.full(len(uniques), np.nan, dtype=object)
+    indexes = np.full(len(uniques), np.nan)
+    totals = np.full(len(uniques), np.nan)
+    search = INSTALLMENT_PATTERN.search
+    for i, title in enumerate(uniques):
+        match = search(title) if isinstance(title, str) else None
+        if match is not None:
+            base, index, total = match.groups()
+            # Titles with nothing before 'Parcela' keep their whole title as base
+            bases[i] = (title if base is None else base).strip()
+            indexes[i] = int(index)
+            totals[i] = int(total)
+    return pd.DataFrame({
+        'base': bases.take(codes),
+        'index': indexes.take(codes),
+        'total': totals.take(codes),
+    }, index=titles.index)
+
+def split_installments(df):
+    """
+    Split transactions into regular ones and 'Parcela X/Y' installments.
+    Installments come back with their title replaced by the base title and
+    with integer 'installment' and 'plan_length' columns.
+    """
+    parts = extract_installments(df['title'])
+    is_parcela = parts['index'].notna()
+    regular = df.loc[~is_parcela, ['date', 'title', 'amount_cents']]
+    installments = df.loc[is_parcela, ['date', 'amount_cents']]
+    parts = parts[is_parcela]
+    installments.insert(1, 'title', parts['base'])
+    installments['installment'] = parts['index'].astype('int64')
+    installments['plan_length'] = parts['total'].astype('int64')
+    return regular, installments
+
+def group_installments(installments, by_plan=False):
+    """
+    Sum installments sharing a base title, keeping the earliest date. With
+    by_plan, installments are grouped per plan (see installment_plans).
+    """
+    if by_plan:
+        return installment_plans(installments)[['date', 'title', 'amount_cents']]
+    grouped = installments.groupby('title', observed=True).agg({
+        'amount_cents': 'sum',
+        'date': 'min'
+    })
+    return pd.DataFrame({
+        'date': grouped['date'].to_numpy(),
+        'title': grouped.index.to_numpy(),
+        'amount_cents': grouped['amount_cents'].to_numpy(),
+    })
+
+def _month_ordinals(dates):
+    # Nullable, so missing dates stay missing instead of turning into floats
+    dates = pd.to_datetime(pd.Series(dates))
+    return (dates.dt.year * 12 + dates.dt.month - 1).astype('Int64').array
+
+def _month_labels(ordinals):
+    ordinals = pd.Series(ordinals, dtype='Int64')
+    labels = (ordinals // 12).astype(str) + '-' + (ordinals % 12 + 1).astype(str).str.zfill(2)
+    return labels.where(ordinals.notna())
+
+def purchase_months(installments):
+    """Month ordinal of each installment's purchase: its month minus installment - 1 (missing without a date)."""
+    return _month_ordinals(installments['date']) - (installments['installment'].to_numpy() - 1)
+
+def installment_plans(installments):
     """
-    # Extract base title (without 'Parcela X/Y')
-    def base_title(title):
-        match = re.match(r"(.+?)\s+Parcela\s+\d+/\d+", title, re.IGNORECASE)
-        return match.group(1).strip() if match else title.strip()
+    Group installments (as returned by split_installments) into plans.
 
-    df = df.copy()
-    df['base_title'] = df['title'].apply(base_title)
-    df['is_parcela'] = df['title'].str.contains(r'Parcela \d+/\d+', case=False, regex=True)
+    A plan is identified by its base title, its length and the purchase
+    month, derived as the month of installment X minus X-1 months, so two
+    purchases at the same store are kept apart. Each plan reports how many
+    installments were seen, whether it is complete or partial in the loaded
+    window, and how many installments are still due after the last one seen.
+    Installments without a date make up plans of their own, with no
+    purchase month.
+    """
+    columns = ['title', 'plan_length', 'purchase_month', 'date', 'last_date', 'amount_cents', 'amount',
+               'paid', 'last_installment', 'remaining', 'installment_amount',
+               'projected_amount', 'status']
+    if installments.empty:
+        return pd.DataFrame(columns=columns)
+    purchase = purchase_months(installments)
+    plans = pd.DataFrame({
+        'title': installments['title'].to_numpy(),
+        'plan_length': installments['plan_length'].to_numpy(),
+        'purchase': purchase,
+        'date': installments['date'].to_numpy(),
+        'amount_cents': installments['amount_cents'].to_numpy(),
+        'installment': installments['installment'].to_numpy(),
+    }).groupby(['title', 'plan_length', 'purchase'], dropna=False).agg(
+        date=('date', 'min'),
+        last_date=('date', 'max'),
+        amount_cents=('amount_cents', 'sum'),
+        paid=('installment', 'nunique'),
+        last_installment=('installment', 'max'),
+    ).reset_index()
+    plans['purchase_month'] = _month_labels(plans['purchase'])
+    plans['amount'] = plans['amount_cents'] / 100
+    plans['remaining'] = (plans['plan_length'] - plans['last_installment']).clip(lower=0)
+    plans['installment_amount'] = plans['amount'] / plans['paid']
+    plans['projected_amount'] = plans['installment_amount'] * plans['remaining']
+    plans['status'] = np.where(plans['paid'] >= plans['plan_length'], 'complete', 'partial')
+    return plans[columns]
+
+def project_installments(plans):
+    """
+    List the installments still due for each plan, one row per future
+    installment, on the same day of the month as the last one seen.
+    """
+    columns = ['date', 'title', 'installment', 'plan_length', 'amount']
+    pending = plans[plans['remaining'] > 0]
+    if pending.empty:
+        return pd.DataFrame(columns=columns)
+    counts = pending['remaining'].to_numpy().astype('int64')
+    rows = pending.loc[pending.index.repeat(counts)]
+    # 1, 2, ... within each plan
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    last = pd.to_datetime(rows['last_date']).reset_index(drop=True)
+    ordinals = _month_ordinals(last) + offsets
+    starts = pd.to_datetime(_month_labels(ordinals) + '-01')
+    days = np.minimum(last.dt.day.to_numpy(), starts.dt.days_in_month.to_numpy())
+    due = starts + pd.to_timedelta(days - 1, unit='D')
+    return pd.DataFrame({
+        'date': due.to_numpy(),
+        'title': rows['title'].to_numpy(),
+        'installment': rows['last_installment'].to_numpy() + offsets,
+        'plan_length': rows['plan_length'].to_numpy(),
+        'amount': rows['installment_amount'].to_numpy(),
+    })
+
+def merge_installments(df, by_plan=False):
+    """
+    Merge transactions with 'Parcela X/Y' in the title, summing their amounts.
+    Keeps other transactions unchanged. With by_plan, installments are merged
+    per plan (base title, plan length and purchase month) instead of per
+    base title.
+    """
+    with stage('merge_installments', rows=len(df)):
+        return _merge_installments(df, by_plan)
 
-    # Group by base_title if it's an installment, else keep as is
-    parcela_df = df[df['is_parcela']]
-    non_parcela_df = df[~df['is_parcela']]
+def _merge_installments(df, by_plan):
+    non_parcela_df, parcela_df = split_installments(df)
 
     if not parcela_df.empty:
         # For installments, sum amounts and keep the earliest date
-        merged = parcela_df.groupby('base_title').agg({
-            'amount': 'sum',
-            'date': 'min'
-        }).reset_index()
-        merged['title'] = merged['base_title']
-        merged = merged[['date', 'title', 'amount']]
+        merged = group_installments(parcela_df, by_plan=by_plan)
         # Combine with non-installment transactions
-        result = pd.concat([non_parcela_df[['date', 'title', 'amount']], merged], ignore_index=True)
+        result = concat_transactions([non_parcela_df, merged])
     else:
-        result = df[['date', 'title', 'amount']]
+        result = non_parcela_df
 
     return result
\ No newline at end of file
@@ -0,0 +1,156 @@
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+
+
+class TableModel:
+    """
+    Table data kept as one NumPy array per column. Rows are only formatted
+    when displayed, and sorting permutes a row order array instead of
+    touching the data.
+    """
+
+    def __init__(self, columns, formatters=None):
+        formatters = formatters or {}
+        self.headings = list(columns)
+        self.columns = [np.asarray(values) for values in columns.values()]
+        self.formatters = [formatters.get(heading, str) for heading in self.headings]
+        self.order = np.arange(len(self.columns[0]) if self.columns else 0)
+        self.sort_heading = None
+        self.descending = False
+
+    @classmethod
+    def from_frame(cls, df, headings, formatters=None):
+        """Build a model from DataFrame columns, given as {heading: column name}."""
+        return cls({heading: df[column].to_numpy() for heading, column in headings.items()}, formatters)
+
+    def __len__(self):
+        return len(self.order)
+
+    def sort(self, heading, descending=None):
+        """Sort by a column; sorting the same column again flips the direction."""
+        if descending is None:
+            descending = heading == self.sort_heading and not self.descending
+        values = pd.Series(self.columns[self.headings.index(heading)])
+        order = values.sort_values(ascending=not descending, kind='stable', na_position='last').index
+        self.order = order.to_numpy()
+        self.sort_heading = heading
+        self.descending = descending
+
+    def row_index(self, position):
+        """Index in the original data of the row shown at a position."""
+        return int(self.order[position])
+
+    def rows(self, start, stop):
+        """Formatted values of the rows shown at positions start to stop."""
+        indexes = self.order[start:stop]
+        formatted = [
+            [formatter(value) for value in column[indexes]]
+            for column, formatter in zip(self.columns, self.formatters)
+        ]
+        return list(zip(*formatted))
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Treeview that only holds the rows currently visible. Scrolling rewrites
+    the values of that fixed window of items, so tables with hundreds of
+    thousands of rows cost no more than a screenful.
+    """
+
+    def __init__(self, master, model, height=10, on_double_click=None):
+        super().__init__(master)
+        self.model = model
+        self.offset = 0
+        self.visible = height
+        self.on_double_click = on_double_click
+        self.selected_index = None
+
+        self.tree = ttk.Treeview(self, columns=model.headings, show='headings', height=height, selectmode='browse')
+        for heading in model.headings:
+            self.tree.heading(heading, text=heading, command=lambda h=heading: self.sort(h))
+            self.tree.column(heading, anchor='center')
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', lambda event: self._scroll(-1 if event.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda event: self._scroll(-1, 'units'))
+        self.tree.bind('<Button-5>', lambda event: self._scroll(1, 'units'))
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<Double-1>', self._on_double_click)
+        self.refresh()
+
+    def set_model(self, model):
+        self.model = model
+        self.offset = 0
+        self.selected_index = None
+        for heading in model.headings:
+            self.tree.heading(heading, text=heading)
+        self.refresh()
+
+    def sort(self, heading):
+        self.model.sort(heading)
+        arrow = ' ▼' if self.model.descending else ' ▲'
+        for other in self.model.headings:
+            self.tree.heading(other, text=other + (arrow if other == heading else ''))
+        self.offset = 0
+        self.refresh()
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self._move_to(int(float(args[1]) * len(self.model)))
+        elif args[0] == 'scroll':
+            self._scroll(int(args[1]), args[2])
+
+    def _scroll(self, amount, what):
+        step = self.visible if what == 'pages' else 1
+        self._move_to(self.offset + amount * step)
+
+    def _move_to(self, offset):
+        offset = max(0, min(offset, len(self.model) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def refresh(self):
+        rows = self.model.rows(self.offset, self.offset + self.visible)
+        items = self.tree.get_children()
+        for i, values in enumerate(rows):
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert('', 'end', iid=f'row{i}', values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        # Keep the selection on the same data row while scrolling
+        self.tree.selection_remove(self.tree.selection())
+        if self.selected_index is not None:
+            positions = np.flatnonzero(self.model.order[self.offset:self.offset + len(rows)] == self.selected_index)
+            if len(positions):
+                self.tree.selection_set(f'row{positions[0]}')
+        total = max(len(self.model), 1)
+        self.scrollbar.set(self.offset / total, min(self.offset + self.visible, total) / total)
+
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # Leave room for the heading row
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, len(self.model) - visible))
+            self.refresh()
+
+    def _position(self, item):
+        return self.offset + self.tree.index(item)
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected_index = self.model.row_index(self._position(selection[0]))
+
+    def _on_double_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if item and self.on_double_click is not None:
+            self.on_double_click(self.model.row_index(self._position(item)))
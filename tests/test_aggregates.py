@@ -0,0 +1,164 @@
+import pandas as pd
+from aggregates import TransactionAggregates
+from categorizer import TransactionCategorizer
+from utils import compact_transactions, merge_installments
+
+
+def make_transactions():
+    return compact_transactions(pd.DataFrame([
+        {"date": "2025-01-01", "title": "Burger King", "amount": 50.0},
+        {"date": "2025-01-01", "title": "Posto Shell", "amount": 100.0},
+        {"date": "2025-02-03", "title": "Burger King", "amount": 30.0},
+        {"date": "2025-02-10", "title": "Assai", "amount": 80.0},
+    ])).assign(category=pd.Categorical(["restaurants", "automotive", "restaurants", "market"]))
+
+
+def test_aggregates_totals():
+    aggregates = TransactionAggregates.from_frame(make_transactions())
+    assert aggregates.category_totals.to_dict() == {"automotive": 100.0, "restaurants": 80.0, "market": 80.0}
+    stores = aggregates.stores.set_index('title')
+    assert stores.loc["Burger King", "amount"] == 80.0
+    assert stores.loc["Burger King", "count"] == 2
+    assert stores.loc["Burger King", "mean"] == 40.0
+    assert aggregates.daily.to_dict() == {
+        pd.Timestamp("2025-01-01"): 150.0, pd.Timestamp("2025-02-03"): 30.0, pd.Timestamp("2025-02-10"): 80.0,
+    }
+    assert aggregates.monthly.to_dict() == {"2025-01": 150.0, "2025-02": 110.0}
+
+
+def test_aggregates_in_chunks_match_single_pass():
+    df = make_transactions()
+    whole = TransactionAggregates.from_frame(df)
+    chunked = TransactionAggregates()
+    chunked.update(df.iloc[:1])
+    chunked.update(df.iloc[1:3])
+    chunked.update(df.iloc[3:])
+    pd.testing.assert_series_equal(chunked.category_totals.sort_index(), whole.category_totals.sort_index())
+    pd.testing.assert_frame_equal(chunked.stores, whole.stores)
+    pd.testing.assert_series_equal(chunked.daily, whole.daily)
+    pd.testing.assert_series_equal(chunked.monthly, whole.monthly)
+
+
+def test_aggregates_store_categories():
+    stores = TransactionAggregates.from_frame(make_transactions()).store_categories
+    burger = stores[stores['title'] == "Burger King"].iloc[0]
+    assert burger['category'] == "restaurants"
+    assert burger['count'] == 2
+    assert burger['mean'] == 40.0
+
+
+def test_aggregates_category_series():
+    aggregates = TransactionAggregates.from_frame(make_transactions())
+    daily = aggregates.category_daily("restaurants")
+    assert list(daily.index.strftime('%Y-%m-%d')) == ["2025-01-01", "2025-02-03"]
+    assert daily.tolist() == [50.0, 30.0]
+    assert aggregates.category_daily("missing").empty
+
+
+def test_aggregates_row_positions_across_updates():
+    df = make_transactions()
+    aggregates = TransactionAggregates()
+    aggregates.update(df.iloc[:2])
+    aggregates.update(df.iloc[2:])
+    assert aggregates.category_rows("restaurants").tolist() == [0, 2]
+    assert aggregates.store_rows("Assai").tolist() == [3]
+    assert aggregates.store_rows("missing").tolist() == []
+    rows = df.iloc[aggregates.category_rows("restaurants")]
+    assert rows['title'].tolist() == ["Burger King", "Burger King"]
+
+
+def test_aggregates_stores_rows():
+    aggregates = TransactionAggregates.from_frame(make_transactions())
+    assert aggregates.stores_rows(["Assai", "Burger King"]).tolist() == [0, 2, 3]
+    assert aggregates.stores_rows([]).tolist() == []
+
+
+def test_aggregates_recategorize_matches_rebuild():
+    from utils import set_categories
+    df = make_transactions()
+    aggregates = TransactionAggregates.from_frame(df)
+    aggregates.recategorize(df, [0, 3], ["fast food", "restaurants"])
+    set_categories(df, [0, 3], ["fast food", "restaurants"])
+    assert df['category'].tolist() == ["fast food", "automotive", "restaurants", "restaurants"]
+    expected = TransactionAggregates.from_frame(df)
+    pd.testing.assert_series_equal(aggregates.category_totals.sort_index(), expected.category_totals.sort_index())
+    def by_store(stores):
+        return stores.sort_values(['title', 'category'], ignore_index=True)
+    pd.testing.assert_frame_equal(by_store(aggregates.store_categories), by_store(expected.store_categories))
+    assert "market" not in aggregates.category_totals
+    assert aggregates.category_rows("restaurants").tolist() == [2, 3]
+    assert aggregates.category_rows("fast food").tolist() == [0]
+    assert aggregates.category_rows("market").tolist() == []
+
+
+def test_aggregates_merchants_group_title_variants():
+    df = compact_transactions(pd.DataFrame([
+        {"date": "2025-01-01", "title": "DROGASIL*123", "amount": 10.0},
+        {"date": "2025-01-02", "title": "Drogasil 04", "amount": 30.0},
+        {"date": "2025-01-03", "title": "Posto Shell", "amount": 25.0},
+        {"date": "2025-01-04", "title": "Assai", "amount": 5.0},
+        {"date": "2025-01-05", "title": "Drogâsil", "amount": 2.0},
+    ])).assign(category="others")
+    aggregates = TransactionAggregates.from_frame(df)
+    merchants = aggregates.merchants.set_index('merchant')
+    assert merchants.loc['drogasil', ['amount', 'count', 'titles']].tolist() == [42.0, 3, 3]
+    assert len(merchants) == 3
+    assert aggregates.merchant_rows('drogasil').tolist() == [0, 1, 4]
+
+    top, others = aggregates.top_merchants(2)
+    assert top['merchant'].tolist() == ['drogasil', 'posto shell']
+    # Shown by their biggest title rather than by the key
+    assert top['name'].tolist() == ['Drogasil 04', 'Posto Shell']
+    assert others['merchant'].tolist() == ['assai']
+    top, others = aggregates.top_merchants(5)
+    assert len(top) == 3 and others.empty
+
+
+def test_aggregates_top_merchants_without_rows():
+    # e.g. a statement with only payments and refunds
+    top, others = TransactionAggregates().top_merchants(30)
+    assert top.empty and others.empty
+    assert others['amount'].sum() == 0
+
+
+def test_aggregates_rollups_follow_changes():
+    df = make_transactions()
+    aggregates = TransactionAggregates.from_frame(df)
+    assert aggregates.rollups.series("restaurants", "month").to_dict() == {"2025-01": 50.0, "2025-02": 30.0}
+    aggregates.recategorize(df, [2], ["market"])
+    assert aggregates.rollups.series("restaurants", "month").to_dict() == {"2025-01": 50.0, "2025-02": 0.0}
+    assert aggregates.rollups.total("market") == 110.0
+
+
+def test_aggregates_store_rows_are_in_date_order():
+    df = compact_transactions(pd.DataFrame([
+        {"date": "2025-03-01", "title": "Assai", "amount": 1.0},
+        {"date": "2025-01-01", "title": "Assai", "amount": 2.0},
+        {"date": "2025-02-01", "title": "Shell", "amount": 3.0},
+        {"date": "2025-02-15", "title": "Assai", "amount": 4.0},
+        {"date": "2024-12-01", "title": "Assai", "amount": 5.0},
+    ])).assign(category="others")
+    aggregates = TransactionAggregates()
+    aggregates.update(df.iloc[:3])
+    # An older statement appended later still lands in date order
+    aggregates.update(df.iloc[3:])
+    assert aggregates.store_rows("Assai").tolist() == [4, 1, 3, 0]
+    assert aggregates.stores_rows(["Shell", "Assai"]).tolist() == [4, 1, 2, 3, 0]
+
+
+def test_aggregates_category_totals_include_undated_rows():
+    df = compact_transactions(pd.DataFrame([
+        {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100.0},
+        {"date": None, "title": "Store X Parcela 2/3", "amount": 100.0},
+        {"date": None, "title": "Assai", "amount": 30.0},
+    ]))
+    categorized = TransactionCategorizer().categorize_transactions(merge_installments(df, by_plan=True))
+    aggregates = TransactionAggregates.from_frame(categorized)
+    assert aggregates.category_totals.sum() == categorized['amount_cents'].sum() / 100
+    assert aggregates.category_totals.to_dict() == {"others": 200.0, "market": 30.0}
+    # Undated rows have no day, so the time series leave them out
+    assert aggregates.daily.sum() == 100.0
+    assert aggregates.category_daily("others").sum() == 100.0
+    assert aggregates.rollups.total("market") == 0.0
+    aggregates.recategorize(categorized, [0, 1], ["health", "health"])
+    assert aggregates.category_totals.to_dict() == {"health": 130.0, "others": 100.0}
@@ -2,4 +2,14 @@ import pytest
 
 def test_import_tkinter():
     import tkinter
-    assert tkinter is not None
\ No newline at end of file
+    assert tkinter is not None
+
+def test_startup_defers_heavy_imports():
+    import os
+    import subprocess
+    import sys
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    code = "import app_ui, sys; print(sorted(m for m in ('pandas', 'matplotlib', 'reportlab') if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=src)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == "[]"
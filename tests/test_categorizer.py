@@ -1,5 +1,6 @@
 import pandas as pd
 from categorizer import TransactionCategorizer
+from utils import compact_transactions
 
 def test_categorize_title_default():
     categorizer = TransactionCategorizer()
@@ -9,10 +10,10 @@ def test_categorize_title_default():
 
 def test_categorize_transactions_removes_negative():
     categorizer = TransactionCategorizer()
-    df = pd.DataFrame([
+    df = compact_transactions(pd.DataFrame([
         {"date": "2025-01-01", "title": "Burger King", "amount": 50},
         {"date": "2025-01-02", "title": "Burger King", "amount": -10},
-    ])
+    ]))
     result = categorizer.categorize_transactions(df)
     assert len(result) == 1
     assert result.iloc[0]['category'] == "restaurants"
@@ -26,4 +27,56 @@ def test_categorize_transactions_with_custom_categories(tmp_path):
     with open(json_path, "w") as f:
         json.dump(categories, f)
     categorizer = TransactionCategorizer(str(json_path))
-    assert categorizer.categorize_title("Starbucks Paulista") == "coffee"
\ No newline at end of file
+    assert categorizer.categorize_title("Starbucks Paulista") == "coffee"
+
+def test_categorize_titles_matches_each_unique_title_once():
+    categorizer = TransactionCategorizer()
+    titles = pd.Series(["iFood", "Posto Shell", "iFood", "Unknown", "iFood"], index=[5, 6, 7, 8, 9])
+    result = categorizer.categorize_titles(titles)
+    assert list(result.index) == [5, 6, 7, 8, 9]
+    assert list(result) == ["online services", "automotive", "online services", "others", "online services"]
+    info = categorizer.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 3, 3)
+
+    categorizer.categorize_titles(pd.Series(["Posto Shell", "Drogasil"]))
+    info = categorizer.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 4)
+
+def test_categorize_titles_cache_is_bounded():
+    categorizer = TransactionCategorizer(cache_size=2)
+    categorizer.categorize_titles(pd.Series(["A", "B", "C"]))
+    assert categorizer.cache_info().currsize == 2
+    # "A" was the least recently used title and has been evicted
+    categorizer.categorize_titles(pd.Series(["A"]))
+    assert categorizer.cache_info().hits == 0
+
+def test_reload_recategorizes_only_changed_titles(tmp_path):
+    import json
+    import os
+    json_path = tmp_path / "categories.json"
+    json_path.write_text(json.dumps({"market": ["assai"], "fuel": ["posto"]}))
+    categorizer = TransactionCategorizer(str(json_path))
+    df = categorizer.categorize_transactions(compact_transactions(pd.DataFrame([
+        {"date": "2025-01-01", "title": "Assai", "amount": 50},
+        {"date": "2025-01-02", "title": "Posto Shell", "amount": 20},
+        {"date": "2025-01-03", "title": "Padaria", "amount": 5},
+    ])))
+    assert not categorizer.source_changed()
+    assert categorizer.reload() == set()
+
+    json_path.write_text(json.dumps({"market": ["assai", "padaria"], "fuel": ["posto"]}))
+    os.utime(json_path, ns=(1, 1))
+    assert categorizer.source_changed()
+    changed = categorizer.reload()
+    assert changed == {"padaria"}
+    assert not categorizer.source_changed()
+    positions, categories = categorizer.recategorize(df, changed)
+    assert positions.tolist() == [2]
+    assert categories.tolist() == ["market"]
+    assert categorizer.categorize_title("Padaria") == "market"
+
+def test_fuzzy_categorizer_recategorizes_everything_on_change():
+    categorizer = TransactionCategorizer(category_keywords={"health": ["drogasil"]}, fuzzy_distance=1)
+    assert categorizer.categorize_title("DROGASL 12") == "health"
+    assert categorizer.set_keywords({"health": ["drogasil"]}) == set()
+    assert categorizer.set_keywords({"health": ["drogasil"], "market": ["assai"]}) is None
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from charts import PieChart, TrendChart
+
+
+def test_pie_chart_updates_wedges_in_place():
+    chart = PieChart(title='Spending', canvas_factory=FigureCanvasAgg)
+    chart.update([1, 1, 2], ['a', 'b', 'c'])
+    wedges = list(chart.wedges)
+    assert chart.full_draws == 1
+    chart.update([2, 1, 1], ['a', 'b', 'c'])
+    assert chart.wedges == wedges
+    assert chart.wedges[0].theta1 == pytest.approx(90)
+    assert chart.wedges[0].theta2 == pytest.approx(270)
+    assert [text.get_text() for text in chart.percents] == ['50%', '25%', '25%']
+    assert (chart.full_draws, chart.blits) == (1, 1)
+
+
+def test_pie_chart_rebuilds_when_slice_count_changes():
+    chart = PieChart(canvas_factory=FigureCanvasAgg)
+    chart.update([1, 1], ['a', 'b'])
+    chart.update([1, 1, 1], ['a', 'b', 'c'])
+    assert len(chart.wedges) == 3
+    assert len(chart.ax.patches) == 3
+    assert [text.get_text() for text in chart.labels] == ['a', 'b', 'c']
+
+
+def test_trend_chart_updates_bars_and_line_in_place():
+    chart = TrendChart(canvas_factory=FigureCanvasAgg)
+    labels = ['2025-01', '2025-02', '2025-03']
+    chart.update(labels, [10, 20, 30], 'Trend', 'Month')
+    bars = list(chart.bars)
+    chart.update(labels, [12, 18, 29], 'Trend', 'Month')
+    assert chart.bars == bars
+    assert [bar.get_height() for bar in chart.bars] == [12, 18, 29]
+    np.testing.assert_allclose(chart.trend.get_ydata(), np.poly1d(np.polyfit([0, 1, 2], [12, 18, 29], 1))([0, 1, 2]))
+    # Same labels and a range that still fits: only the artists are redrawn
+    assert (chart.full_draws, chart.blits) == (1, 1)
+
+
+def test_trend_chart_redraws_when_axes_change():
+    chart = TrendChart(canvas_factory=FigureCanvasAgg)
+    chart.update(['a', 'b'], [10, 20], 'Trend', 'Date')
+    chart.update(['a', 'b', 'c'], [10, 20, 500], 'Trend', 'Date')
+    assert len(chart.bars) == 3
+    assert len(chart.ax.patches) == 3
+    assert chart.ax.get_ylim()[1] >= 500
+    assert [label.get_text() for label in chart.ax.get_xticklabels()] == ['a', 'b', 'c']
+    assert chart.full_draws == 2
+
+
+def test_trend_chart_thins_tick_labels():
+    chart = TrendChart(canvas_factory=FigureCanvasAgg)
+    labels = [f"2025-01-{day:02d}" for day in range(1, 32)]
+    chart.update(labels, np.ones(31), 'Trend', 'Date')
+    assert len(chart.bars) == 31
+    assert [label.get_text() for label in chart.ax.get_xticklabels()] == labels[::3]
+
+
+def test_pie_chart_keeps_labels_inside_the_figure():
+    chart = PieChart(figsize=(4, 4), canvas_factory=FigureCanvasAgg)
+    labels = ["market", "online services", "restaurants", "transportation", "entertainment", "electronics"]
+    for values in ([1] * 6, [5, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 9]):
+        chart.update(values, labels)
+        renderer = chart.canvas.get_renderer()
+        for text in chart.labels:
+            extent = text.get_window_extent(renderer)
+            assert extent.x0 >= 0 and extent.x1 <= chart.figure.bbox.width
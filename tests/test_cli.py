@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import pandas as pd
+from cli import find_statements, group_statements, main
+
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def write_statement(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def make_cardholders(tmp_path):
+    write_statement(tmp_path / "in" / "ana" / "may.csv", [
+        {"date": "2025-05-01", "title": "Burger King", "amount": 50.0},
+        {"date": "2025-05-04", "title": "Store X Parcela 1/2", "amount": 100.0},
+    ])
+    write_statement(tmp_path / "in" / "ana" / "june.csv", [
+        {"date": "2025-06-04", "title": "Store X Parcela 2/2", "amount": 100.0},
+        {"date": "2025-06-05", "title": "Refund", "amount": -10.0},
+    ])
+    write_statement(tmp_path / "in" / "bruno" / "may.csv", [
+        {"date": "2025-05-02", "title": "Posto Shell", "amount": 120.0},
+    ])
+
+
+def test_find_and_group_statements(tmp_path):
+    make_cardholders(tmp_path)
+    (tmp_path / "in" / "notes.txt").write_text("not a statement")
+    paths = find_statements([str(tmp_path / "in"), str(tmp_path / "in" / "*" / "may.csv")])
+    assert len(paths) == 3
+    assert group_statements(paths) == {
+        "ana": [p for p in paths if os.sep + "ana" + os.sep in p],
+        "bruno": [p for p in paths if os.sep + "bruno" + os.sep in p],
+    }
+    by_file = group_statements(paths, group_by='file')
+    assert sorted(by_file) == ["june", "may", "may_2"]
+
+
+def test_main_writes_reports_per_cardholder(tmp_path, capsys):
+    make_cardholders(tmp_path)
+    out = tmp_path / "out"
+    status = main([str(tmp_path / "in"), "-o", str(out), "-w", "2", "-c", str(tmp_path / "missing.json")])
+    assert status == 0
+    ana = pd.read_csv(out / "ana" / "ana_categorized.csv")
+    assert ana.to_dict('records') == [
+        {"date": "2025-05-01", "title": "Burger King", "amount": 50.0, "category": "restaurants"},
+        {"date": "2025-05-04", "title": "Store X", "amount": 200.0, "category": "others"},
+    ]
+    assert (out / "ana" / "ana_report.pdf").exists()
+    assert (out / "bruno" / "bruno_report.pdf").exists()
+    assert "2 of 2 cardholder(s)" in capsys.readouterr().out
+
+
+def test_main_without_statements(tmp_path):
+    assert main([str(tmp_path / "*.csv"), "--no-pdf"]) == 2
+
+
+def test_cli_does_not_import_tkinter():
+    code = "import cli, sys; print('tkinter' in sys.modules or 'matplotlib.backends.backend_tkagg' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_main_stream_writes_summaries(tmp_path, capsys):
+    make_cardholders(tmp_path)
+    out = tmp_path / "out"
+    status = main([str(tmp_path / "in"), "-o", str(out), "-w", "1", "--stream", "-c", str(tmp_path / "missing.json")])
+    assert status == 0
+    ana = pd.read_csv(out / "ana" / "ana_summary.csv")
+    assert ana.to_dict('records') == [
+        {"category": "others", "amount": 200.0, "percentage": 80.0},
+        {"category": "restaurants", "amount": 50.0, "percentage": 20.0},
+    ]
+    assert not (out / "ana" / "ana_categorized.csv").exists()
+    assert "ana: 2 statement(s), 2 transactions, total 250.00" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+import pytest
+import pandas as pd
+from categorizer import TransactionCategorizer
+from loader import load_statements
+
+
+def write_statements(tmp_path):
+    statements = [
+        [
+            {"date": "2025-05-01", "title": "Burger King", "amount": 50.0},
+            {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100.0},
+            {"date": "2025-05-05", "title": "Refund", "amount": -10.0},
+        ],
+        [
+            {"date": "2025-06-01", "title": "Posto Shell", "amount": 120.0},
+            {"date": "2025-06-04", "title": "Store X Parcela 2/3", "amount": 100.0},
+        ],
+        [
+            {"date": "2025-07-02", "title": "Burger King", "amount": 35.0},
+            {"date": "2025-07-04", "title": "Store X Parcela 3/3", "amount": 100.0},
+        ],
+    ]
+    paths = []
+    for i, rows in enumerate(statements):
+        path = tmp_path / f"statement{i}.csv"
+        pd.DataFrame(rows).to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def test_parallel_load_matches_serial(tmp_path):
+    paths = write_statements(tmp_path)
+    serial_list, serial = load_statements(paths, TransactionCategorizer(), max_workers=1)
+    parallel_list, parallel = load_statements(paths, TransactionCategorizer(), max_workers=2)
+    assert len(parallel_list) == len(serial_list) == 3
+    pd.testing.assert_frame_equal(parallel, serial)
+    store_x = parallel[parallel['title'] == "Store X"]
+    assert store_x['amount_cents'].tolist() == [30000]
+
+
+def test_parallel_load_primes_categorizer_cache(tmp_path):
+    paths = write_statements(tmp_path)
+    categorizer = TransactionCategorizer()
+    load_statements(paths, categorizer, max_workers=2)
+    # Every merged title was categorized in a worker, so the final pass only hits the cache
+    assert categorizer.cache_info().misses == 0
+
+
+def test_load_reports_progress_and_can_be_aborted(tmp_path):
+    paths = write_statements(tmp_path)
+    events = []
+
+    def record(stage, current=None, total=None, rows=None):
+        events.append((stage, current, total, rows))
+
+    load_statements(paths, TransactionCategorizer(), max_workers=1, progress=record)
+    assert events[0] == ("Reading files", 0, 3, 0)
+    assert events[3] == ("Reading files", 3, 3, 7)
+    assert [e[0] for e in events[4:]] == ["Merging installments", "Categorizing"]
+
+    class Abort(Exception):
+        pass
+
+    def abort(stage, current=None, total=None, rows=None):
+        if current == 1:
+            raise Abort()
+
+    with pytest.raises(Abort):
+        load_statements(paths, TransactionCategorizer(), max_workers=2, progress=abort)
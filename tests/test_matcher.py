@@ -0,0 +1,95 @@
+import random
+import pandas as pd
+from matcher import KeywordMatcher, FuzzyIndex, changed_keywords, contains_any, edit_distance
+from merchants import fold_text
+
+
+def naive_match(category_keywords, title):
+    title_lower = fold_text(title)
+    for category, keywords in category_keywords.items():
+        for keyword in keywords:
+            if fold_text(keyword) in title_lower:
+                return category
+    return 'others'
+
+
+def test_first_category_wins():
+    keywords = {
+        "utilities": ["celular", "oi"],
+        "electronics": ["celular", "smartphone"],
+    }
+    matcher = KeywordMatcher(keywords)
+    assert matcher.match("Loja do Celular") == "utilities"
+    assert matcher.match("Smartphone Oi") == "utilities"
+    assert matcher.match("Smartphone Store") == "electronics"
+    assert matcher.match("Padaria") == "others"
+
+
+def test_overlapping_keywords_prefer_earlier_category():
+    keywords = {
+        "automotive": ["abasteceai"],
+        "market": ["abastece", "ai"],
+    }
+    matcher = KeywordMatcher(keywords)
+    assert matcher.match("ABASTECEAI Posto") == "automotive"
+    assert matcher.match("Abastece Mais") == "market"
+
+
+def test_match_many_agrees_with_naive_loop():
+    keywords = {
+        "a": ["ab", "x+y"],
+        "b": ["b", "99"],
+        "c": ["abc", "ç"],
+    }
+    rng = random.Random(0)
+    alphabet = "abcxy+9ç "
+    titles = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))) for _ in range(500)]
+    series = pd.Series(titles, index=range(100, 600))
+    result = KeywordMatcher(keywords).match_many(series)
+    assert list(result.index) == list(series.index)
+    assert list(result) == [naive_match(keywords, t) for t in titles]
+
+
+def test_changed_keywords():
+    old = {"market": ["assai", "delta"], "health": ["raia"], "others2": ["delta"]}
+    assert changed_keywords(old, old) == set()
+    new = {"market": ["assai"], "health": ["raia", "delta"], "fuel": ["shell"]}
+    assert changed_keywords(old, new) == {"delta", "shell"}
+    # Reordering categories changes which keyword wins, so anything may change
+    assert changed_keywords(old, {"health": ["raia"], "market": ["assai", "delta"]}) is None
+
+
+def test_contains_any():
+    titles = ["Posto Shell", "Drogasil", None, "Assai Atacadista"]
+    assert contains_any(titles, {"shell", "assai"}).tolist() == [True, False, False, True]
+    assert contains_any(titles, set()).tolist() == [False] * 4
+
+
+def test_accents_and_case_are_ignored():
+    matcher = KeywordMatcher({"clothing": ["calçado"], "health": ["DROGASIL"]})
+    assert matcher.match("CALCADOS SAO JOAO") == "clothing"
+    assert matcher.match("Drogâsil Centro") == "health"
+    assert contains_any(["Drogâsil"], {"drogasil"}).tolist() == [True]
+
+
+def test_edit_distance_and_fuzzy_index():
+    assert edit_distance("drogasil", "drogasil", 1) == 0
+    assert edit_distance("drogasl", "drogasil", 1) == 1
+    assert edit_distance("drogas", "drogasil", 1) == 2
+    index = FuzzyIndex(["drogasil", "netflix", "shell"], max_distance=1)
+    assert index.search("drogasl") == ["drogasil"]
+    assert index.search("netflyx") == ["netflix"]
+    assert index.search("drgsl") == []
+
+
+def test_fuzzy_matching_is_only_a_fallback():
+    keywords = {"health": ["drogasil"], "market": ["assai", "drogasl loja"]}
+    assert KeywordMatcher(keywords).match("DROGASL CENTRO") == "others"
+    fuzzy = KeywordMatcher(keywords, max_distance=1)
+    assert fuzzy.match("DROGASL CENTRO") == "health"
+    # Exact matches still win, and short keywords are never fuzzy matched
+    assert fuzzy.match("Drogasl Loja 3") == "market"
+    assert fuzzy.match("Assaí Atacadista") == "market"
+    assert fuzzy.match("Asai Atacadista") == "others"
+    titles = pd.Series(["DROGASL", "Drogasil", "nada"])
+    assert list(fuzzy.match_many(titles)) == ["health", "health", "others"]
@@ -0,0 +1,23 @@
+from merchants import fold_text, merchant_key
+
+
+def test_fold_text():
+    assert fold_text("  Drogâsil   CENTRO ") == "drogasil centro"
+    assert fold_text("Calçados São João") == "calcados sao joao"
+
+
+def test_merchant_key_groups_store_variants():
+    titles = ["DROGASIL*123", "Drogasil 04", "Drogâsil", "DROGASIL LOJA 12", "drogasil - filial 3"]
+    assert {merchant_key(title) for title in titles} == {"drogasil"}
+
+
+def test_merchant_key_strips_processor_prefixes():
+    assert merchant_key("PG *Loja X") == "loja x"
+    assert merchant_key("IFD*Padaria Estrela") == "padaria estrela"
+    # Without the '*' a leading word is part of the name
+    assert merchant_key("PG Distribuidora") == "pg distribuidora"
+
+
+def test_merchant_key_keeps_titles_that_are_only_numbers():
+    assert merchant_key("99") == "99"
+    assert merchant_key("99 Taxi 12") == "99 taxi"
@@ -0,0 +1,52 @@
+import os
+import pstats
+import pandas as pd
+import pytest
+import profiling
+from utils import compact_transactions, merge_installments
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.jsonl"
+    profiling.enable(str(path), str(tmp_path / "profiles"))
+    yield path
+    profiling.enable(None, None)
+
+
+def test_stages_are_noops_when_disabled(tmp_path):
+    assert not profiling.enabled()
+    with profiling.stage("anything") as timing:
+        timing.add_rows(10)
+    assert timing is profiling.stage("other")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stages_record_time_rows_and_memory(report):
+    df = compact_transactions(pd.DataFrame([
+        {"date": "2025-05-04", "title": "Store X Parcela 1/2", "amount": 100},
+        {"date": "2025-06-04", "title": "Store X Parcela 2/2", "amount": 100},
+        {"date": "2025-05-01", "title": "Other Store", "amount": 50},
+    ]))
+    merge_installments(df)
+    records = profiling.read_report(str(report))
+    stages = {record["stage"]: record for record in records}
+    assert stages["merge_installments"]["rows"] == 3
+    assert stages["compact_transactions"]["rows"] == 3
+    assert stages["merge_installments"]["seconds"] >= 0
+    assert all(record["pid"] == os.getpid() for record in records)
+    totals = profiling.summarize(records)
+    assert {total["stage"] for total in totals} == set(stages)
+    assert "merge_installments" in profiling.format_summary(totals)
+
+
+def test_instrumented_profiles_the_call(report, tmp_path):
+    @profiling.instrumented("job", profile=True)
+    def job(x):
+        return x * 2
+
+    assert job(21) == 42
+    assert profiling.read_report(str(report))[-1]["stage"] == "job"
+    dumps = list((tmp_path / "profiles").glob("job-*.pstats"))
+    assert len(dumps) == 1
+    assert pstats.Stats(str(dumps[0])).total_calls > 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from rollups import CategoryRollups
+
+
+def make_rollups():
+    index = pd.MultiIndex.from_arrays([
+        ["market", "health", "market", "market"],
+        pd.to_datetime(["2025-01-30", "2025-02-01", "2025-02-03", "2025-03-10"]),
+    ], names=["category", "date"])
+    return CategoryRollups(pd.Series([1000, 2500, 3000, 500], index=index))
+
+
+def test_series_per_granularity():
+    rollups = make_rollups()
+    assert rollups.series("market", "month").to_dict() == {"2025-01": 10.0, "2025-02": 30.0, "2025-03": 5.0}
+    assert rollups.series("market", "year").to_dict() == {"2025": 45.0}
+    days = rollups.series("market", "day")
+    assert len(days) == 40 and days.sum() == 45.0
+    assert days["2025-01-31"] == 0.0
+    assert rollups.series("health", "month").to_dict() == {"2025-01": 0.0, "2025-02": 25.0, "2025-03": 0.0}
+
+
+def test_series_and_totals_within_a_range():
+    rollups = make_rollups()
+    # Weeks start on Monday; the first week is cut by the range
+    weeks = rollups.series("market", "week", "2025-02-01", "2025-02-10")
+    assert weeks.to_dict() == {"2025-01-27": 0.0, "2025-02-03": 30.0, "2025-02-10": 0.0}
+    assert rollups.total("market") == 45.0
+    assert rollups.total("market", "2025-01-31", "2025-02-03") == 30.0
+    assert rollups.total("market", end="2025-01-30") == 10.0
+    assert rollups.total("unknown") == 0.0
+    assert rollups.series("market", "day", "2025-04-01").empty
+
+
+def test_series_match_a_groupby():
+    rng = np.random.default_rng(0)
+    dates = pd.Timestamp("2024-11-20") + pd.to_timedelta(rng.integers(0, 500, 2000), unit="D")
+    df = pd.DataFrame({"category": rng.choice(["a", "b"], 2000), "date": dates, "cents": rng.integers(1, 10000, 2000)})
+    days = df.groupby(["category", "date"])["cents"].sum()
+    rollups = CategoryRollups(days)
+    start, end = pd.Timestamp("2025-02-15"), pd.Timestamp("2025-09-03")
+    inside = df[(df["category"] == "a") & df["date"].between(start, end)]
+    expected = inside.groupby(inside["date"].dt.to_period("M").astype(str))["cents"].sum() / 100
+    series = rollups.series("a", "month", start, end)
+    assert series[series > 0].to_dict() == expected.to_dict()
+    assert rollups.total("a", start, end) == inside["cents"].sum() / 100
+
+
+def test_empty_rollups():
+    rollups = CategoryRollups()
+    assert rollups.series("market", "month").empty
+    assert rollups.total("market") == 0.0
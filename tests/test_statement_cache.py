@@ -0,0 +1,77 @@
+import os
+import pandas as pd
+from categorizer import TransactionCategorizer
+from loader import load_statements
+from statement_cache import StatementCache
+from utils import read_csv, compact_transactions
+
+
+def write_statement(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_cache_roundtrip_matches_csv(tmp_path):
+    path = write_statement(tmp_path / "may.csv", [
+        {"date": "2025-05-01", "title": "Burger King", "amount": 50.5},
+        {"date": "2025-05-02", "title": None, "amount": 30.0},
+    ])
+    cache = StatementCache(str(tmp_path / "cache"))
+    keywords = TransactionCategorizer().category_keywords
+    key = cache.key(path, keywords)
+    assert cache.get(key) is None
+    transactions = compact_transactions(read_csv(path))
+    cache.put(key, transactions, {"Burger King": "restaurants"})
+    cached, title_categories = cache.get(key)
+    pd.testing.assert_frame_equal(cached, transactions)
+    assert title_categories == {"Burger King": "restaurants"}
+
+
+def test_cache_key_depends_on_keywords(tmp_path):
+    path = write_statement(tmp_path / "may.csv", [{"date": "2025-05-01", "title": "A", "amount": 1.0}])
+    cache = StatementCache(str(tmp_path / "cache"))
+    assert cache.key(path, {"a": ["x"]}) != cache.key(path, {"a": ["y"]})
+    assert cache.key(path, {"a": ["x"], "b": ["y"]}) != cache.key(path, {"b": ["y"], "a": ["x"]})
+    assert cache.key(path, {"a": ["x"]}) != cache.key(path, {"a": ["x"]}, fuzzy_distance=1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = StatementCache(str(tmp_path / "cache"))
+    df = pd.DataFrame({"date": ["2025-05-01"], "title": ["A"], "amount": [1.0]})
+    for i, key in enumerate(["old", "new"]):
+        cache.put(key, df, {})
+        os.utime(os.path.join(cache.cache_dir, key), (i, i))
+    cache.max_bytes = cache.size() - 1
+    cache.evict()
+    assert cache.get("old") is None
+    assert cache.get("new") is not None
+    cache.clear()
+    assert cache.entries() == []
+
+
+def test_loader_uses_cache(tmp_path):
+    paths = [
+        write_statement(tmp_path / "may.csv", [{"date": "2025-05-04", "title": "Store X Parcela 1/2", "amount": 100.0}]),
+        write_statement(tmp_path / "june.csv", [
+            {"date": "2025-06-04", "title": "Store X Parcela 2/2", "amount": 100.0},
+            {"date": "2025-06-05", "title": "iFood", "amount": 40.0},
+        ]),
+    ]
+    cache = StatementCache(str(tmp_path / "cache"))
+    _, first = load_statements(paths, TransactionCategorizer(), max_workers=1, cache=cache)
+    assert len(cache.entries()) == 2
+    categorizer = TransactionCategorizer()
+    _, second = load_statements(paths, categorizer, max_workers=2, cache=cache)
+    pd.testing.assert_frame_equal(first, second)
+    assert categorizer.cache_info().misses == 0
+
+
+def test_cache_roundtrip_keeps_categories_and_missing_text(tmp_path):
+    cache = StatementCache(str(tmp_path / "cache"))
+    df = pd.DataFrame({
+        "title": pd.Categorical(["b", None, "a"], categories=["a", "b", "unused"]),
+        "note": pd.Series(["x", None, "y"], dtype=object),
+    })
+    cache.put("entry", df, {})
+    cached, _ = cache.get("entry")
+    pd.testing.assert_frame_equal(cached, df)
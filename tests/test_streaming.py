@@ -0,0 +1,78 @@
+import pandas as pd
+from aggregates import TransactionAggregates
+from categorizer import TransactionCategorizer
+from streaming import stream_aggregates
+from utils import read_csv, compact_transactions, merge_installments
+
+
+def write_statements(tmp_path, frames):
+    paths = []
+    for i, df in enumerate(frames):
+        path = tmp_path / f"statement{i}.csv"
+        df.to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def test_stream_aggregates_matches_in_memory_path(tmp_path):
+    first = pd.DataFrame([
+        {"date": "2025-05-01", "title": "Burger King", "amount": 50.0},
+        {"date": "2025-05-02", "title": "Assai", "amount": 30.0},
+        {"date": "2025-05-03", "title": "Drogasil", "amount": -20.0},
+        {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100.0},
+        {"date": "2025-05-05", "title": "Posto Shell", "amount": 120.0},
+    ])
+    second = pd.DataFrame([
+        {"date": "2025-06-01", "title": "Burger King", "amount": 25.0},
+        {"date": "2025-06-04", "title": "Store X Parcela 2/3", "amount": 100.0},
+        {"date": "2025-06-05", "title": "Store X Parcela 3/3", "amount": -300.0},
+        {"date": "2025-06-06", "title": "iFood Parcela 1/2", "amount": 40.0},
+    ])
+    paths = write_statements(tmp_path, [first, second])
+
+    categorizer = TransactionCategorizer()
+    streamed = stream_aggregates(paths, categorizer, chunksize=2)
+
+    loaded = compact_transactions(pd.concat([read_csv(p) for p in paths], ignore_index=True))
+    expected = TransactionAggregates.from_frame(
+        categorizer.categorize_transactions(merge_installments(loaded))
+    )
+
+    pd.testing.assert_series_equal(streamed.category_totals.sort_index(), expected.category_totals.sort_index())
+    pd.testing.assert_frame_equal(streamed.stores, expected.stores)
+    pd.testing.assert_series_equal(streamed.daily, expected.daily)
+    pd.testing.assert_series_equal(streamed.monthly, expected.monthly)
+    # The refunded Store X plan nets to -100 and is dropped after merging
+    assert "Store X" not in set(streamed.stores['title'])
+
+
+def test_stream_aggregates_by_plan_matches_in_memory_path(tmp_path):
+    # Two purchases at Store X, with installments spread over chunks and files
+    first = pd.DataFrame([
+        {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100.0},
+        {"date": "2025-05-10", "title": "Assai", "amount": 30.0},
+        {"date": "2025-06-04", "title": "Store X Parcela 2/3", "amount": 100.0},
+        {"date": "2025-06-20", "title": "Store X Parcela 1/2", "amount": 60.0},
+    ])
+    second = pd.DataFrame([
+        {"date": "2025-07-04", "title": "Store X Parcela 3/3", "amount": 100.0},
+        {"date": "2025-07-20", "title": "Store X Parcela 2/2", "amount": 60.0},
+        {"date": None, "title": "Store X Parcela 2/2", "amount": 15.0},
+    ])
+    paths = write_statements(tmp_path, [first, second])
+
+    categorizer = TransactionCategorizer()
+    streamed = stream_aggregates(paths, categorizer, chunksize=2, by_plan=True)
+
+    loaded = compact_transactions(pd.concat([read_csv(p) for p in paths], ignore_index=True))
+    expected = TransactionAggregates.from_frame(
+        categorizer.categorize_transactions(merge_installments(loaded, by_plan=True))
+    )
+
+    pd.testing.assert_frame_equal(streamed.store_categories, expected.store_categories)
+    pd.testing.assert_series_equal(streamed.daily, expected.daily)
+    pd.testing.assert_series_equal(streamed.category_totals.sort_index(), expected.category_totals.sort_index())
+    assert streamed.category_totals.sum() == 465.0
+    # Both purchases, plus the undated installment as a plan of its own
+    store_x = streamed.store_categories.set_index('title').loc['Store X']
+    assert store_x['count'] == 3 and store_x['amount'] == 435.0
@@ -0,0 +1,57 @@
+import threading
+import time
+from tasks import BackgroundTask, ProgressEvent, format_progress
+
+
+def wait_for_end(task, timeout=5):
+    events = []
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        events.extend(task.poll())
+        if events and events[-1][0] != 'progress':
+            return events
+        time.sleep(0.01)
+    raise AssertionError("task did not finish")
+
+
+def test_background_task_reports_progress_and_result():
+    def run(progress):
+        progress("Reading files", 1, 2, 10)
+        progress("Reading files", 2, 2, 25)
+        return "loaded"
+
+    events = wait_for_end(BackgroundTask(run).start())
+    assert events == [
+        ('progress', ProgressEvent("Reading files", 1, 2, 10)),
+        ('progress', ProgressEvent("Reading files", 2, 2, 25)),
+        ('done', "loaded"),
+    ]
+
+
+def test_background_task_cancellation():
+    started = threading.Event()
+
+    def run(progress):
+        started.set()
+        while True:
+            progress("Categorizing")
+            time.sleep(0.01)
+
+    task = BackgroundTask(run).start()
+    started.wait(5)
+    task.cancel()
+    assert wait_for_end(task)[-1] == ('cancelled', None)
+
+
+def test_background_task_reports_errors():
+    def run(progress):
+        raise ValueError("bad csv")
+
+    kind, error = wait_for_end(BackgroundTask(run).start())[-1]
+    assert kind == 'error'
+    assert str(error) == "bad csv"
+
+
+def test_format_progress():
+    assert format_progress(ProgressEvent("Reading files", 2, 5, 1200)) == "Reading files (2 of 5) - 1,200 rows..."
+    assert format_progress(ProgressEvent("Categorizing", None, None, None)) == "Categorizing..."
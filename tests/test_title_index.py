@@ -0,0 +1,41 @@
+from title_index import TitleIndex, normalize_title
+
+
+def make_index():
+    index = TitleIndex()
+    index.add(["Burger King", "Posto Shell", "Burger King", "Drogasil  Centro", "Uber Trip"])
+    return index
+
+
+def test_normalize_title():
+    assert normalize_title("  Drogasil   CENTRO ") == "drogasil centro"
+
+
+def test_search_substring_ignores_case_and_spaces():
+    index = make_index()
+    assert len(index) == 4
+    assert index.search("burger") == ["Burger King"]
+    assert index.search("SIL cen") == ["Drogasil  Centro"]
+    assert index.search("ing") == ["Burger King"]
+    assert index.search("nothing") == []
+
+
+def test_search_requires_contiguous_match():
+    index = TitleIndex()
+    index.add(["abcd bcde"])
+    # Every trigram of the query appears, but not next to each other
+    assert index.search("abcde") == []
+    assert index.search("d bcd") == ["abcd bcde"]
+
+
+def test_search_short_and_empty_queries():
+    index = make_index()
+    assert index.search("u") == ["Burger King", "Uber Trip"]
+    assert index.search("") == ["Burger King", "Posto Shell", "Drogasil  Centro", "Uber Trip"]
+
+
+def test_add_is_incremental():
+    index = make_index()
+    index.add(["Burger Queen", "Burger King", None])
+    assert len(index) == 5
+    assert index.search("burger") == ["Burger King", "Burger Queen"]
@@ -1,14 +1,14 @@
 import pandas as pd
-from utils import read_csv, write_csv, filter_negative_transactions, generate_pdf, merge_installments
+from utils import read_csv, write_csv, filter_negative_transactions, generate_pdf, LazyFlowables, merge_installments, extract_installments, split_installments, installment_plans, project_installments, compact_transactions, concat_transactions, memory_usage, format_date
 
 def test_filter_negative_transactions():
-    df = pd.DataFrame([
+    df = compact_transactions(pd.DataFrame([
         {"date": "2025-01-01", "title": "A", "amount": 10},
         {"date": "2025-01-02", "title": "B", "amount": -5},
-    ])
+    ]))
     filtered = filter_negative_transactions(df)
     assert len(filtered) == 1
-    assert filtered.iloc[0]['amount'] == 10
+    assert filtered.iloc[0]['amount_cents'] == 1000
 
 def test_read_write_csv(tmp_path):
     df = pd.DataFrame([
@@ -19,15 +19,82 @@ def test_read_write_csv(tmp_path):
     df2 = read_csv(file)
     assert df2.equals(df)
 
-def test_generate_pdf_runs(tmp_path):
+def test_compact_transactions():
     df = pd.DataFrame([
-        {"date": "2025-01-01", "title": "A", "amount": 10, "category": "market"},
-        {"date": "2025-01-02", "title": "B", "amount": 20, "category": "market"},
+        {"date": "2025-01-01", "title": "A", "amount": 10.1},
+        {"date": "2025-01-02", "title": "A", "amount": 0.29},
+        {"date": "2025-01-03", "title": "B", "amount": None},
     ])
+    compact = compact_transactions(df)
+    assert compact['date'].dtype.kind == 'M'
+    assert isinstance(compact['title'].dtype, pd.CategoricalDtype)
+    # Cents are exact where float amounts are not
+    assert compact['amount_cents'].tolist() == [1010, 29]
+    assert compact['amount_cents'].sum() == 1039
+    assert memory_usage(compact) < memory_usage(df)
+
+def test_concat_transactions_keeps_categoricals():
+    first = compact_transactions(pd.DataFrame([{"date": "2025-01-01", "title": "A", "amount": 1}]))
+    second = compact_transactions(pd.DataFrame([{"date": "2025-01-02", "title": "B", "amount": 2}]))
+    result = concat_transactions([first, second])
+    assert isinstance(result['title'].dtype, pd.CategoricalDtype)
+    assert result['title'].tolist() == ["A", "B"]
+
+def test_generate_pdf_runs(tmp_path):
+    df = compact_transactions(pd.DataFrame([
+        {"date": "2025-01-01", "title": "A", "amount": 10},
+        {"date": "2025-01-02", "title": "B", "amount": 20},
+    ])).assign(category="market")
     file = tmp_path / "test.pdf"
     generate_pdf(str(file), df)
     assert file.exists()
 
+def test_generate_pdf_large_report_splits_tables(tmp_path):
+    df = compact_transactions(pd.DataFrame([
+        {"date": f"2025-01-{day % 28 + 1:02d}", "title": f"Store {i}", "amount": i + 1}
+        for i, day in enumerate(range(200))
+    ])).assign(category="market")
+    regular = generate_pdf(str(tmp_path / "regular.pdf"), df)
+    large = generate_pdf(str(tmp_path / "large.pdf"), df, large=True)
+    assert large >= regular > 1
+    assert (tmp_path / "large.pdf").stat().st_size > 0
+
+def test_lazy_flowables_pulls_on_demand():
+    pulled = []
+    def numbers():
+        for i in range(20):
+            pulled.append(i)
+            yield i
+    flowables = LazyFlowables(numbers(), lookahead=3)
+    assert len(flowables) == 3
+    assert flowables[0] == 0
+    del flowables[0]
+    flowables[0:0] = ['split']
+    flowables.insert(0, 'back')
+    assert [flowables[i] for i in range(3)] == ['back', 'split', 1]
+    assert len(pulled) == 3
+    assert flowables[:5] == ['back', 'split', 1, 2, 3]
+    assert len(pulled) == 4
+    consumed = []
+    while len(flowables):
+        consumed.append(flowables[0])
+        del flowables[0]
+    assert consumed[-1] == 19
+
+def test_lazy_flowables_build_with_keep_with_next(tmp_path):
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+    styles = getSampleStyleSheet()
+    heading = ParagraphStyle('KeptHeading', parent=styles['Heading2'], keepWithNext=1)
+    def flowables():
+        for i in range(30):
+            # Headings keep with the paragraph after them, which slices the list
+            yield Paragraph(f"Heading {i}", heading)
+            yield Paragraph("Body " * 50, styles['Normal'])
+    doc = SimpleDocTemplate(str(tmp_path / "keep.pdf"))
+    doc.build(LazyFlowables(flowables(), lookahead=3))
+    assert doc.page > 1
+
 def test_merge_installments():
     df = pd.DataFrame([
         {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100},
@@ -35,8 +102,95 @@ def test_merge_installments():
         {"date": "2025-07-04", "title": "Store X Parcela 3/3", "amount": 100},
         {"date": "2025-05-01", "title": "Other Store", "amount": 50},
     ])
-    merged = merge_installments(df)
+    merged = merge_installments(compact_transactions(df))
     # Should have two rows: one for "Store X" (sum 300), one for "Other Store"
     assert len(merged) == 2
-    assert any((merged['title'] == "Store X") & (merged['amount'] == 300))
-    assert any((merged['title'] == "Other Store") & (merged['amount'] == 50))
\ No newline at end of file
+    assert any((merged['title'] == "Store X") & (merged['amount_cents'] == 30000))
+    assert any((merged['title'] == "Other Store") & (merged['amount_cents'] == 5000))
+
+def test_extract_installments():
+    titles = pd.Series(["Store X Parcela 1/3", "Other Store", "parcela 2/12", " Loja  PARCELA 10/12", None])
+    parts = extract_installments(titles).astype(object).where(lambda p: p.notna(), None)
+    assert parts['base'].tolist() == ["Store X", None, "parcela 2/12", "Loja", None]
+    assert parts['index'].tolist() == [1, None, 2, 10, None]
+    assert parts['total'].tolist() == [3, None, 12, 12, None]
+
+def test_merge_installments_keeps_earliest_date():
+    df = pd.DataFrame([
+        {"date": "2025-06-04", "title": "Store X Parcela 2/2", "amount": 50.5},
+        {"date": "2025-05-04", "title": "Store X Parcela 1/2", "amount": 50.5},
+        {"date": "2025-05-01", "title": "Store X", "amount": 10},
+    ])
+    merged = merge_installments(compact_transactions(df))
+    assert merged.to_dict('records') == [
+        {"date": pd.Timestamp("2025-05-01"), "title": "Store X", "amount_cents": 1000},
+        {"date": pd.Timestamp("2025-05-04"), "title": "Store X", "amount_cents": 10100},
+    ]
+
+def test_merge_installments_by_plan_keeps_purchases_apart():
+    df = pd.DataFrame([
+        {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100},
+        {"date": "2025-06-04", "title": "Store X Parcela 2/3", "amount": 100},
+        {"date": "2025-06-20", "title": "Store X Parcela 1/3", "amount": 60},
+        {"date": "2025-07-04", "title": "Store X Parcela 3/3", "amount": 100},
+        {"date": "2025-07-20", "title": "Store X Parcela 2/3", "amount": 60},
+    ])
+    df = compact_transactions(df)
+    assert merge_installments(df)['amount_cents'].tolist() == [42000]
+    merged = merge_installments(df, by_plan=True)
+    assert merged.to_dict('records') == [
+        {"date": pd.Timestamp("2025-05-04"), "title": "Store X", "amount_cents": 30000},
+        {"date": pd.Timestamp("2025-06-20"), "title": "Store X", "amount_cents": 12000},
+    ]
+
+def test_merge_installments_by_plan_keeps_undated_installments():
+    df = compact_transactions(pd.DataFrame([
+        {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100},
+        {"date": None, "title": "Store X Parcela 2/3", "amount": 100},
+    ]))
+    assert merge_installments(df, by_plan=True)['amount_cents'].sum() == 20000
+    _, installments = split_installments(df)
+    plans = installment_plans(installments)
+    assert plans['purchase_month'].iloc[0] == "2025-05"
+    assert plans['purchase_month'].isna().iloc[1]
+    assert project_installments(plans)['installment'].tolist() == [2, 3, 3]
+    assert format_date(plans['date'].iloc[1]) == ""
+
+def test_installment_plans_and_projection():
+    df = pd.DataFrame([
+        {"date": "2025-05-04", "title": "Store X Parcela 1/3", "amount": 100},
+        {"date": "2025-06-04", "title": "Store X Parcela 2/3", "amount": 100},
+        {"date": "2025-07-04", "title": "Store X Parcela 3/3", "amount": 100},
+        {"date": "2025-11-30", "title": "Loja Y Parcela 2/4", "amount": 50},
+        {"date": "2025-05-01", "title": "Other Store", "amount": 50},
+    ])
+    _, installments = split_installments(compact_transactions(df))
+    plans = installment_plans(installments).set_index('title')
+    assert plans.loc["Store X", "status"] == "complete"
+    assert plans.loc["Store X", "purchase_month"] == "2025-05"
+    assert plans.loc["Store X", "remaining"] == 0
+    assert plans.loc["Loja Y", "status"] == "partial"
+    assert plans.loc["Loja Y", "purchase_month"] == "2025-10"
+    assert plans.loc["Loja Y", "remaining"] == 2
+    assert plans.loc["Loja Y", "projected_amount"] == 100
+
+    projected = project_installments(plans.reset_index())
+    assert projected.to_dict('records') == [
+        {"date": pd.Timestamp("2025-12-30"), "title": "Loja Y", "installment": 3, "plan_length": 4, "amount": 50.0},
+        {"date": pd.Timestamp("2026-01-30"), "title": "Loja Y", "installment": 4, "plan_length": 4, "amount": 50.0},
+    ]
+
+def test_generate_pdf_parallel_matches_serial(tmp_path, monkeypatch):
+    from reportlab import rl_config
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+    rows = []
+    for i in range(6):
+        for day in range(1, 4):
+            rows.append({"date": f"2025-01-0{day}", "title": f"Store {i}", "amount": 10 * day + i})
+    df = compact_transactions(pd.DataFrame(rows))
+    df['category'] = df['title'].str.replace("Store ", "cat")
+    serial = tmp_path / "serial.pdf"
+    parallel = tmp_path / "parallel.pdf"
+    generate_pdf(str(serial), df, max_workers=1)
+    generate_pdf(str(parallel), df, max_workers=3)
+    assert serial.read_bytes() == parallel.read_bytes()
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from virtual_table import TableModel
+
+
+def make_model():
+    df = pd.DataFrame({
+        "date": ["2025-01-03", "2025-01-01", "2025-01-02", "2025-01-01"],
+        "title": ["C", "A", "B", "D"],
+        "amount": [30.0, 10.0, 20.0, 10.0],
+    })
+    return TableModel.from_frame(
+        df,
+        {"Date": "date", "Title": "title", "Amount": "amount"},
+        formatters={"Amount": lambda v: f"{v:.2f}"},
+    )
+
+
+def test_rows_are_formatted_on_demand():
+    model = make_model()
+    assert len(model) == 4
+    assert model.rows(1, 3) == [("2025-01-01", "A", "10.00"), ("2025-01-02", "B", "20.00")]
+    assert model.rows(3, 10) == [("2025-01-01", "D", "10.00")]
+
+
+def test_sort_permutes_rows_and_toggles_direction():
+    model = make_model()
+    model.sort("Amount")
+    assert [row[1] for row in model.rows(0, 4)] == ["A", "D", "B", "C"]
+    model.sort("Amount")
+    assert model.descending
+    assert [row[1] for row in model.rows(0, 4)] == ["C", "B", "A", "D"]
+    assert model.row_index(0) == 0
+    model.sort("Date", descending=False)
+    assert [row[1] for row in model.rows(0, 4)] == ["A", "D", "B", "C"]
+
+
+def test_large_model_only_formats_requested_window():
+    calls = []
+
+    def formatter(value):
+        calls.append(value)
+        return str(value)
+
+    model = TableModel({"N": np.arange(500000)}, formatters={"N": formatter})
+    model.sort("N", descending=True)
+    assert model.rows(0, 3) == [("499999",), ("499998",), ("499997",)]
+    assert len(calls) == 3